@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+VMware Versions Client
+Lightweight read-only API for tools that only need the scraped versions.
+Loads vmware-versions.json (from a local path or an HTTP URL) once, keeps a
+typed snapshot in memory and revalidates it after a TTL.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import requests
+
+from vmware_release import Release, iter_product_entries
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class VersionSnapshot:
+    """Immutable view of one vmware-versions.json document."""
+    last_updated: Optional[str]
+    products: Dict[str, Release]
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "VersionSnapshot":
+        """Build a snapshot from the vmware-versions.json layout."""
+        products = {key: Release.from_dict(key, value)
+                    for _, key, value in iter_product_entries(data)}
+        return cls(last_updated=data.get("LastUpdated"), products=products)
+
+
+class VersionClient:
+    """
+    Cached reader for vmware-versions.json.
+
+    The snapshot is revalidated at most once per ttl seconds: local files are
+    reloaded only if their mtime or size changed, URLs are re-fetched with
+    If-None-Match / If-Modified-Since. Lookups between revalidations are plain
+    dict reads.
+
+    Example:
+        client = VersionClient("vmware-versions.json")
+        client.latest("ESXi_8_0").build_number
+        client.is_current("VMwareTools", "25218885")
+    """
+
+    def __init__(self, source: str = "vmware-versions.json", ttl: float = 300.0,
+                 timeout: float = 10.0):
+        self.source = source
+        self.ttl = ttl
+        self.timeout = timeout
+        self._is_url = source.startswith(("http://", "https://"))
+        self._snapshot: Optional[VersionSnapshot] = None
+        self._checked_at = 0.0
+        self._validator: Optional[Tuple] = None
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> VersionSnapshot:
+        """
+        Return the current snapshot, revalidating it if the TTL has expired.
+
+        Raises:
+            OSError, ValueError or requests.RequestException if the source has
+            never been loaded successfully
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._checked_at < self.ttl:
+            return snapshot
+        with self._lock:
+            if self._snapshot is None or time.monotonic() - self._checked_at >= self.ttl:
+                try:
+                    self._refresh()
+                except (OSError, ValueError, requests.RequestException) as e:
+                    if self._snapshot is None:
+                        raise
+                    logger.warning(f"Could not refresh {self.source}, serving cached versions: {e}")
+                self._checked_at = time.monotonic()
+            return self._snapshot
+
+    def invalidate(self) -> None:
+        """Force the next lookup to revalidate the source."""
+        self._checked_at = 0.0
+
+    def latest(self, product_key: str) -> Optional[Release]:
+        """
+        Get the latest release for a product key such as "ESXi_8_0",
+        "vCenter_9_0" or "VMwareTools".
+
+        Returns:
+            Release or None if the product is unknown
+        """
+        return self.snapshot().products.get(product_key)
+
+    def is_current(self, product_key: str, build: str) -> bool:
+        """
+        Check whether build is the latest build number for product_key.
+
+        Returns:
+            True if build matches the latest known build, False otherwise
+        """
+        product = self.latest(product_key)
+        return product is not None and product.build_number == str(build).strip()
+
+    def _refresh(self) -> None:
+        if self._is_url:
+            self._refresh_url()
+        else:
+            self._refresh_file()
+
+    def _refresh_file(self) -> None:
+        stat = os.stat(self.source)
+        validator = (stat.st_mtime_ns, stat.st_size)
+        if self._snapshot is not None and validator == self._validator:
+            return
+        with open(self.source, "r", encoding="utf-8") as f:
+            self._snapshot = VersionSnapshot.from_dict(json.load(f))
+        self._validator = validator
+        logger.debug(f"Loaded {len(self._snapshot.products)} products from {self.source}")
+
+    def _refresh_url(self) -> None:
+        headers = {}
+        if self._snapshot is not None and self._validator:
+            etag, last_modified = self._validator
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        response = requests.get(self.source, headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and self._snapshot is not None:
+            return
+        response.raise_for_status()
+        self._snapshot = VersionSnapshot.from_dict(response.json())
+        self._validator = (response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        logger.debug(f"Loaded {len(self._snapshot.products)} products from {self.source}")
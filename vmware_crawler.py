@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+VMware Release Link Crawler
+Optional stage that fetches the release-notes and download pages linked from
+the KB tables and attaches short summaries (page title, CVE IDs, package
+files) to each release record. Fetches run on a bounded worker pool with a
+per-host rate limit and their own deadline, and a visited set with HTTP
+validators is persisted across runs so unchanged pages are not downloaded
+again.
+"""
+
+import html
+import json
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urljoin, urlsplit
+
+import requests
+
+from vmware_release import iter_product_entries
+from vmware_resilience import Deadline
+
+logger = logging.getLogger(__name__)
+
+CVE_RE = re.compile(r'\bCVE-\d{4}-\d{4,7}\b')
+TITLE_RE = re.compile(r'<title[^>]*>(.*?)</title>', re.DOTALL | re.IGNORECASE)
+HREF_RE = re.compile(r'<a\s[^>]*href="([^"]+)"', re.IGNORECASE)
+# Files listed on download pages such as packages-prod.broadcom.com/tools/...
+PACKAGE_RE = re.compile(r'\.(?:exe|msi|zip|iso|tar\.gz|tgz|rpm|deb|vib)$', re.IGNORECASE)
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+
+def summarize_page(url: str, content: str) -> Dict:
+    """
+    Extract a short summary from a linked page.
+
+    Returns:
+        Dict with "Title", "CVEs" (sorted, unique) and "Packages" (file names
+        linked from a download listing); empty values are omitted
+    """
+    summary = {}
+    title_match = TITLE_RE.search(content)
+    if title_match:
+        title = re.sub(r'\s+', ' ', html.unescape(re.sub(r'<[^>]+>', '', title_match.group(1)))).strip()
+        if title:
+            summary["Title"] = title
+    cves = sorted(set(CVE_RE.findall(content)))
+    if cves:
+        summary["CVEs"] = cves
+    packages = []
+    for href in HREF_RE.findall(content):
+        path = urlsplit(urljoin(url, html.unescape(href))).path
+        name = path.rsplit('/', 1)[-1]
+        if PACKAGE_RE.search(name) and name not in packages:
+            packages.append(name)
+    if packages:
+        summary["Packages"] = packages
+    return summary
+
+
+class HostRateLimiter:
+    """Spaces requests to the same host at least 1/rate seconds apart."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, host: str) -> float:
+        """Reserve the next request slot for host and return the seconds to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + self.interval
+            return slot - now
+
+
+class LinkCrawler:
+    """
+    Crawls the "Links" of release records and attaches "References" summaries.
+
+    extra_links adds pages per product key that the KB rows do not link to,
+    such as the VMware Tools download listing. The visited set maps each URL to its last summary, fetch time and HTTP
+    validators. A URL is fetched again only after revisit seconds, and then
+    with If-None-Match/If-Modified-Since, so most runs make no requests.
+    """
+
+    def __init__(self, state_path: Optional[str] = "vmware-crawl-state.json",
+                 workers: int = 4,
+                 rate: float = 1.0,
+                 deadline: float = 30.0,
+                 timeout: float = 15.0,
+                 revisit: float = 86400.0,
+                 max_links: int = 50,
+                 extra_links: Optional[Dict[str, List[str]]] = None):
+        self.state_path = state_path
+        self.workers = max(1, workers)
+        self.limiter = HostRateLimiter(rate)
+        self.deadline = deadline
+        self.timeout = timeout
+        self.revisit = revisit
+        self.max_links = max_links
+        self.extra_links = extra_links or {}
+        self.visited: Dict[str, Dict] = self.load_state()
+        self._lock = threading.Lock()
+
+    def load_state(self) -> Dict[str, Dict]:
+        if not self.state_path:
+            return {}
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f).get("visited", {})
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable crawl state {self.state_path}: {e}")
+            return {}
+
+    def save_state(self, keep: Iterable[str]) -> None:
+        """Persist the visited set, dropping URLs no release links to anymore."""
+        if not self.state_path:
+            return
+        keep = set(keep)
+        visited = {url: entry for url, entry in self.visited.items() if url in keep}
+        tmp_path = f"{self.state_path}.tmp.{os.getpid()}"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"visited": visited}, f, indent=2, sort_keys=True, ensure_ascii=False)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            logger.warning(f"Could not save crawl state {self.state_path}: {e}")
+
+    def _due(self, url: str, now: float) -> bool:
+        entry = self.visited.get(url)
+        return entry is None or now - entry.get("fetched_at", 0) >= self.revisit
+
+    def _visit(self, url: str, deadline: Deadline) -> None:
+        wait = self.limiter.reserve(urlsplit(url).netloc)
+        if wait >= deadline.remaining():
+            logger.debug(f"Crawl deadline reached before {url}")
+            return
+        time.sleep(wait)
+
+        with self._lock:
+            entry = dict(self.visited.get(url, {}))
+        headers = dict(HEADERS)
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        try:
+            response = requests.get(url, headers=headers,
+                                    timeout=max(0.1, min(self.timeout, deadline.remaining())))
+            if response.status_code != 304:
+                response.raise_for_status()
+                entry = {"summary": summarize_page(url, response.text),
+                         "etag": response.headers.get("ETag"),
+                         "last_modified": response.headers.get("Last-Modified")}
+        except requests.RequestException as e:
+            logger.warning(f"Could not crawl {url}: {e}")
+            return
+        entry["fetched_at"] = time.time()
+        with self._lock:
+            self.visited[url] = entry
+
+    def crawl(self, urls: Iterable[str]) -> Dict[str, Dict]:
+        """
+        Fetch every due URL on the worker pool within the crawl deadline.
+
+        Returns:
+            Dict mapping each URL with a known summary to that summary
+        """
+        urls = list(dict.fromkeys(urls))[:self.max_links]
+        now = time.time()
+        due = [url for url in urls if self._due(url, now)]
+        if due:
+            deadline = Deadline(self.deadline)
+            logger.info(f"Crawling {len(due)} of {len(urls)} linked page(s)")
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(due))) as pool:
+                list(pool.map(lambda url: self._visit(url, deadline), due))
+        self.save_state(urls)
+        return self.known(urls)
+
+    def known(self, urls: Iterable[str]) -> Dict[str, Dict]:
+        """
+        Summaries of already crawled URLs, without any requests.
+
+        Returns:
+            Dict mapping each URL with a known summary to that summary
+        """
+        return {url: self.visited[url].get("summary", {}) for url in urls if url in self.visited}
+
+    def _links(self, key: str, record: Dict) -> List[str]:
+        links = list(record.get("Links", []))
+        return links + [url for url in self.extra_links.get(key, []) if url not in links]
+
+    def annotate(self, result: Dict, fetch: bool = True) -> Dict:
+        """
+        Attach the summaries of the links of every release in result.
+
+        Args:
+            result: Result in the vmware-versions.json layout
+            fetch: Crawl due links first; if False, only summaries from
+                earlier crawls are used and no requests are made
+
+        Returns:
+            A copy of result in which each release with crawled links has a
+            "References" list of {"Url", "Title", "CVEs", "Packages"} dicts
+        """
+        urls = (url for _, key, record in iter_product_entries(result)
+                for url in self._links(key, record))
+        summaries = self.crawl(urls) if fetch else self.known(urls)
+
+        def annotated(key: str, record: Dict) -> Dict:
+            references = [dict(Url=url, **summaries[url]) for url in self._links(key, record)
+                          if url in summaries]
+            return dict(record, References=references) if references else record
+
+        annotated_result = dict(result)
+        for section, key, record in iter_product_entries(result):
+            if section == key:
+                annotated_result[section] = annotated(key, record)
+            else:
+                if annotated_result[section] is result[section]:
+                    annotated_result[section] = dict(result[section])
+                annotated_result[section][key] = annotated(key, record)
+        return annotated_result
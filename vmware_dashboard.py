@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+VMware Versions Dashboard Shell
+Renders a static, client-rendered alternative to vmware-versions.html: a small
+HTML page with content-hashed CSS and JS assets that fetches a compact,
+minified versions JSON and builds the cards in the browser. The shell only
+changes when this template does, so version changes only move the JSON.
+"""
+
+import glob
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, List
+
+from vmware_outputs import iter_products
+from vmware_sections import display_name
+
+logger = logging.getLogger(__name__)
+
+SHELL_CSS = """\
+*{margin:0;padding:0;box-sizing:border-box}
+body{font-family:'Segoe UI',Tahoma,Geneva,Verdana,sans-serif;padding:20px}
+.container{max-width:1200px;margin:0 auto;border-radius:20px;box-shadow:0 20px 40px rgba(0,0,0,.1);overflow:hidden}
+.header{background:linear-gradient(135deg,#667eea 0%,#764ba2 100%);color:#fff;padding:30px;text-align:center}
+.header h1{font-size:2.5em;margin-bottom:10px;font-weight:300}
+.header p{font-size:1.1em;opacity:.9}
+.content{padding:40px}
+.family{color:#333;margin:10px 0 20px;font-weight:600}
+.version-card{background:#fff;border-radius:15px;padding:25px;margin-bottom:25px;box-shadow:0 10px 30px rgba(0,0,0,.1);border-left:5px solid #667eea}
+.version-card.stale{border-left-color:#e67e22}
+.version-card h3{color:#333;margin-bottom:20px;font-size:1.5em;font-weight:600}
+.version-info{display:grid;grid-template-columns:repeat(auto-fit,minmax(200px,1fr));gap:20px}
+.info-item{background:#f8f9fa;padding:15px;border-radius:10px;border-left:4px solid #667eea}
+.info-label{font-weight:600;color:#666;margin-bottom:5px;font-size:.9em;text-transform:uppercase;letter-spacing:.5px}
+.info-value{font-size:1.1em;color:#333;font-weight:500}
+.download-btn{background:linear-gradient(135deg,#27ae60 0%,#2ecc71 100%);color:#fff;text-decoration:none;padding:12px 25px;border-radius:8px;font-weight:600;display:inline-block;margin-top:20px}
+.refresh-btn{background:linear-gradient(135deg,#667eea 0%,#764ba2 100%);color:#fff;border:none;padding:15px 30px;border-radius:10px;font-size:1.1em;cursor:pointer;display:block;margin:30px auto 0}
+.footer{background:#f8f9fa;padding:20px;text-align:center;border-top:1px solid #e9ecef;color:#666;font-size:.9em}
+.footer a{color:#667eea;text-decoration:none}
+@media (max-width:768px){.header h1{font-size:2em}.content{padding:20px}.version-info{grid-template-columns:1fr}}
+"""
+
+SHELL_JS = """\
+(function () {
+  "use strict";
+  var FIELDS = [["Version", "Version"], ["ReleaseName", "Release Name"],
+                ["ReleaseDate", "Release Date"], ["BuildNumber", "Build Number"],
+                ["AvailableAs", "Available As"], ["ToolInternalVersion", "Tool Internal Version"]];
+  var TOOLS_DOWNLOAD = "https://packages-prod.broadcom.com/tools/releases/latest/windows/";
+  var cards = document.getElementById("cards");
+  var status = document.getElementById("status");
+  var src = document.body.getAttribute("data-src");
+
+  function el(tag, className, text) {
+    var node = document.createElement(tag);
+    if (className) node.className = className;
+    if (text !== undefined) node.textContent = text;
+    return node;
+  }
+
+  function render(data) {
+    var fragment = document.createDocumentFragment();
+    var family = null;
+    data.products.forEach(function (product) {
+      if (product.Product !== family) {
+        family = product.Product;
+        fragment.appendChild(el("h2", "family", family));
+      }
+      var card = el("div", product.Stale ? "version-card stale" : "version-card");
+      card.appendChild(el("h3", null, product.Title + (product.Stale ? " (stale)" : "")));
+      var info = card.appendChild(el("div", "version-info"));
+      FIELDS.forEach(function (field) {
+        if (product[field[0]] === undefined) return;
+        var item = info.appendChild(el("div", "info-item"));
+        item.appendChild(el("div", "info-label", field[1]));
+        item.appendChild(el("div", "info-value", product[field[0]]));
+      });
+      if (product.Key === "VMwareTools") {
+        var link = card.appendChild(el("a", "download-btn", "Download the latest VMware Tools"));
+        link.href = TOOLS_DOWNLOAD;
+        link.target = "_blank";
+      }
+      fragment.appendChild(card);
+    });
+    cards.replaceChildren(fragment);
+  }
+
+  function load() {
+    // "no-cache" makes the browser revalidate its cached copy with
+    // If-None-Match / If-Modified-Since, so unchanged data costs a 304.
+    fetch(src, {cache: "no-cache"}).then(function (response) {
+      if (!response.ok) throw new Error("HTTP " + response.status);
+      var modified = response.headers.get("Last-Modified");
+      return response.json().then(function (data) {
+        render(data);
+        status.textContent = modified ? "Last changed: " + new Date(modified).toLocaleString() : "";
+      });
+    }).catch(function (error) {
+      status.textContent = "Could not load version data (" + error.message + ")";
+    });
+  }
+
+  document.getElementById("refresh").addEventListener("click", load);
+  load();
+})();
+"""
+
+SHELL_HTML = """\
+<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>VMware by Broadcom Versions Dashboard</title>
+<link rel="stylesheet" href="{css}">
+<script defer src="{js}"></script>
+</head>
+<body data-src="{data_url}">
+<div class="container">
+<div class="header">
+<h1>VMware by Broadcom Versions Dashboard</h1>
+<p>Latest version information for VMware products</p>
+<p id="status">Loading&hellip;</p>
+</div>
+<div class="content">
+<div id="cards"></div>
+<button id="refresh" class="refresh-btn">Refresh</button>
+</div>
+<div class="footer">
+<p>Data sources: <a href="https://knowledge.broadcom.com/external/article/304809/build-numbers-and-versions-of-vmware-too.html" target="_blank">VMware Tools</a> | <a href="https://knowledge.broadcom.com/external/article?legacyId=2143832" target="_blank">ESXi Versions</a> | <a href="https://knowledge.broadcom.com/external/article?articleNumber=326316" target="_blank">vCenter Versions</a></p>
+<p>&copy; 2025 by <a href="https://www.ivobeerens.nl" target="_blank">www.ivobeerens.nl</a></p>
+</div>
+</div>
+</body>
+</html>
+"""
+
+
+def _asset_path(shell_path: str, extension: str, content: str) -> str:
+    stem = os.path.splitext(shell_path)[0]
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()[:12]
+    return f"{stem}.{digest}.{extension}"
+
+
+def render_shell(shell_path: str, data_path: str) -> Dict[str, str]:
+    """
+    Render the dashboard shell and its content-hashed assets.
+
+    The asset file names contain a hash of their content, so they can be
+    served with a long cache lifetime; the output only changes when the
+    template or the paths do.
+
+    Args:
+        shell_path: Path of the HTML shell
+        data_path: Path of the compact JSON the shell fetches
+
+    Returns:
+        Dict mapping output path to content (HTML shell, CSS and JS)
+    """
+    css_path = _asset_path(shell_path, "css", SHELL_CSS)
+    js_path = _asset_path(shell_path, "js", SHELL_JS)
+    shell_dir = os.path.dirname(os.path.abspath(shell_path))
+    data_url = os.path.relpath(os.path.abspath(data_path), shell_dir).replace(os.sep, "/")
+    html = SHELL_HTML.format(css=os.path.basename(css_path), js=os.path.basename(js_path),
+                             data_url=data_url)
+    return {shell_path: html, css_path: SHELL_CSS, js_path: SHELL_JS}
+
+
+def render_compact_json(model: Dict) -> str:
+    """
+    Render the minified product list the shell fetches. Run timestamps are
+    left out so the file only changes when a release does; the shell shows
+    the response's Last-Modified instead.
+    """
+    products = []
+    for name, release, stale in iter_products(model):
+        entry = {"Key": release.product_key, "Product": name,
+                 "Title": name if release.product_key == "VMwareTools" else display_name(release.product_key)}
+        entry.update(release.to_dict())
+        if stale:
+            entry["Stale"] = True
+        products.append(entry)
+    return json.dumps({"products": products}, ensure_ascii=False, separators=(",", ":"))
+
+
+def prune_assets(shell_path: str, keep: List[str]) -> List[str]:
+    """
+    Delete hashed assets of earlier shell templates next to shell_path.
+
+    Args:
+        shell_path: Path of the HTML shell
+        keep: Asset paths of the current shell
+
+    Returns:
+        Paths that were removed
+    """
+    stem = os.path.splitext(shell_path)[0]
+    keep = {os.path.abspath(path) for path in keep}
+    removed = []
+    for extension in ("css", "js"):
+        for path in glob.glob(f"{glob.escape(stem)}.{'[0-9a-f]' * 12}.{extension}"):
+            if os.path.abspath(path) in keep:
+                continue
+            try:
+                os.unlink(path)
+                removed.append(path)
+            except OSError as e:
+                logger.warning(f"Could not remove old dashboard asset {path}: {e}")
+    return removed
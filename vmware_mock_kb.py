@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Mock Broadcom KB Server
+Serves the saved debug-*.html pages at the paths of the three KB article URLs
+so the scraper's whole fetch pipeline can be exercised offline. Latency,
+bandwidth, chunked transfer, ETag/304 handling, 429/5xx errors and mid-body
+disconnects can all be configured to reproduce a slow or flaky Broadcom site.
+"""
+
+import hashlib
+import logging
+import os
+import random
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+from vmware_tools_scraper import ESXI_URL, TOOLS_URL, VCENTER_URL, VMwareVersionScraper
+
+logger = logging.getLogger(__name__)
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Source name -> (KB article URL, default page file next to this module)
+ARTICLES = {
+    "tools": (TOOLS_URL, os.path.join(_HERE, "debug-tools-content.html")),
+    "esxi": (ESXI_URL, os.path.join(_HERE, "debug-esxi-content.html")),
+    "vcenter": (VCENTER_URL, os.path.join(_HERE, "debug-vcenter-content.html")),
+}
+
+
+def _request_target(url: str) -> str:
+    parts = urlsplit(url)
+    return parts.path + (f"?{parts.query}" if parts.query else "")
+
+
+@dataclass
+class MockConfig:
+    """Behavior of the mock server; all knobs default to a fast, healthy server."""
+    pages: Dict[str, str] = field(default_factory=lambda: {name: page for name, (_, page) in ARTICLES.items()})
+    latency: float = 0.0            # seconds before the response starts
+    bandwidth: int = 0              # bytes per second, 0 = unlimited
+    chunked: bool = False           # use Transfer-Encoding: chunked
+    etag: bool = True               # send ETag/Last-Modified and honor conditional requests
+    charset: Optional[str] = "utf-8"  # charset in Content-Type (None: omit it)
+    error_rate: float = 0.0         # probability of answering with an error status
+    error_statuses: List[int] = field(default_factory=lambda: [503])
+    disconnect_rate: float = 0.0    # probability of dropping the connection mid-body
+    seed: Optional[int] = None
+
+
+class MockKBServer:
+    """Threaded HTTP server serving the KB pages according to a MockConfig."""
+
+    def __init__(self, config: MockConfig, host: str = "127.0.0.1", port: int = 0):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.stats: Dict[str, int] = {}
+        self._stats_lock = threading.Lock()
+        self._bodies = {}
+        for name, (url, _) in ARTICLES.items():
+            path = config.pages[name]
+            with open(path, "rb") as f:
+                body = f.read()
+            self._bodies[_request_target(url)] = (
+                body,
+                '"' + hashlib.sha1(body).hexdigest() + '"',
+                formatdate(os.path.getmtime(path), usegmt=True)
+            )
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] = self.stats.get(key, 0) + 1
+
+    def start(self) -> "MockKBServer":
+        """Serve in a background thread."""
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+            def do_GET(self):
+                config = server.config
+                page = server._bodies.get(self.path)
+                if config.latency:
+                    time.sleep(config.latency)
+                if page is None:
+                    server.count("404")
+                    self._send_empty(404)
+                    return
+
+                if config.error_rate and server.rng.random() < config.error_rate:
+                    status = server.rng.choice(config.error_statuses)
+                    server.count(str(status))
+                    self._send_empty(status, {"Retry-After": "1"} if status == 429 else None)
+                    return
+
+                body, etag, last_modified = page
+                if config.etag and (self.headers.get("If-None-Match") == etag
+                                    or self.headers.get("If-Modified-Since") == last_modified):
+                    server.count("304")
+                    self._send_empty(304, {"ETag": etag, "Last-Modified": last_modified})
+                    return
+
+                self.send_response(200)
+                content_type = "text/html"
+                if config.charset:
+                    content_type += f"; charset={config.charset}"
+                self.send_header("Content-Type", content_type)
+                if config.etag:
+                    self.send_header("ETag", etag)
+                    self.send_header("Last-Modified", last_modified)
+                if config.chunked:
+                    self.send_header("Transfer-Encoding", "chunked")
+                else:
+                    self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+
+                disconnect_at = None
+                if config.disconnect_rate and server.rng.random() < config.disconnect_rate:
+                    disconnect_at = len(body) // 2
+                self._send_body(body, disconnect_at)
+
+            def _send_empty(self, status: int, headers: Optional[Dict[str, str]] = None):
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def _send_body(self, body: bytes, disconnect_at: Optional[int]):
+                config = server.config
+                chunk_size = 16384
+                if config.bandwidth:
+                    chunk_size = max(1024, min(chunk_size, config.bandwidth // 10))
+                sent = 0
+                try:
+                    while sent < len(body):
+                        chunk = body[sent:sent + chunk_size]
+                        if disconnect_at is not None and sent + len(chunk) > disconnect_at:
+                            chunk = chunk[:disconnect_at - sent]
+                            self._write(chunk)
+                            server.count("disconnect")
+                            self.close_connection = True
+                            self.connection.shutdown(socket.SHUT_RDWR)
+                            return
+                        self._write(chunk)
+                        sent += len(chunk)
+                        if config.bandwidth:
+                            time.sleep(len(chunk) / config.bandwidth)
+                    if config.chunked:
+                        self.wfile.write(b"0\r\n\r\n")
+                    server.count("200")
+                except (BrokenPipeError, ConnectionResetError):
+                    self.close_connection = True
+
+            def _write(self, data: bytes):
+                if not data:
+                    return
+                if server.config.chunked:
+                    self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                else:
+                    self.wfile.write(data)
+                self.wfile.flush()
+
+        return Handler
+
+
+def run_benchmark(server: MockKBServer, runs: int, workers: int = 1, deadline: float = 60.0,
+                  cold: bool = False) -> bool:
+    """
+    Run the full scraper against the mock server several times and report
+    wall-clock timings. Runs share one working directory (so the conditional
+    request and parse caches are exercised) unless cold is True.
+
+    Returns:
+        True if every run succeeded
+    """
+    timings = []
+    failures = 0
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="vmware-mock-bench-") as root:
+        try:
+            for i in range(runs):
+                workdir = os.path.join(root, f"run-{i + 1}" if cold else "shared")
+                os.makedirs(workdir, exist_ok=True)
+                os.chdir(workdir)
+                scraper = VMwareVersionScraper(base_url=server.base_url, workers=workers,
+                                               deadline=deadline)
+                start = time.perf_counter()
+                ok = scraper.run()
+                timings.append(time.perf_counter() - start)
+                failures += not ok
+                print(f"run {i + 1:3}: {timings[-1] * 1000:8.1f} ms {'ok' if ok else 'FAILED'}", flush=True)
+        finally:
+            os.chdir(cwd)
+
+    print(f"runs={runs} workers={workers} failures={failures} "
+          f"min={min(timings) * 1000:.1f}ms median={statistics.median(timings) * 1000:.1f}ms "
+          f"max={max(timings) * 1000:.1f}ms")
+    print("server responses: " + ", ".join(f"{k}={v}" for k, v in sorted(server.stats.items())))
+    return failures == 0
+
+
+def main():
+    """Run the mock KB server, or benchmark the scraper against it."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Mock Broadcom KB server for offline scraper testing')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to bind (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8808, help='Port to listen on (default: 8808)')
+    parser.add_argument('--page', action='append', default=[], metavar='SOURCE=PATH',
+                        help='Serve PATH for tools, esxi or vcenter (default: debug-<source>-content.html)')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Seconds to wait before each response (default: 0)')
+    parser.add_argument('--bandwidth', type=int, default=0,
+                        help='Throttle bodies to this many bytes/second (default: unlimited)')
+    parser.add_argument('--chunked', action='store_true', help='Use chunked transfer encoding')
+    parser.add_argument('--no-etag', action='store_true', help='Disable ETag/Last-Modified and 304s')
+    parser.add_argument('--charset', default='utf-8',
+                        help='Charset to declare in Content-Type, empty to omit it (default: utf-8)')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='Probability of answering with an error status (default: 0)')
+    parser.add_argument('--error-status', default='503',
+                        help='Comma-separated statuses to inject, e.g. 429,500,503 (default: 503)')
+    parser.add_argument('--disconnect-rate', type=float, default=0.0,
+                        help='Probability of dropping the connection mid-body (default: 0)')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed for injected faults')
+    parser.add_argument('--bench', type=int, default=0, metavar='RUNS',
+                        help='Instead of serving forever, run the scraper RUNS times against the server')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Scraper workers for --bench (default: 1)')
+    parser.add_argument('--deadline', type=float, default=60.0,
+                        help='Scraper run deadline for --bench (default: 60)')
+    parser.add_argument('--cold', action='store_true',
+                        help='Use a fresh working directory (no caches) for each --bench run')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING if args.bench else logging.INFO,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    config = MockConfig(latency=args.latency, bandwidth=args.bandwidth, chunked=args.chunked,
+                        etag=not args.no_etag, charset=args.charset or None, error_rate=args.error_rate,
+                        error_statuses=[int(s) for s in args.error_status.split(',')],
+                        disconnect_rate=args.disconnect_rate, seed=args.seed)
+    for spec in args.page:
+        name, path = spec.split('=', 1)
+        if name not in ARTICLES:
+            parser.error(f"Unknown source {name!r}; expected one of {', '.join(ARTICLES)}")
+        config.pages[name] = path
+    # Resolve page paths before --bench changes the working directory.
+    config.pages = {name: os.path.abspath(path) for name, path in config.pages.items()}
+
+    server = MockKBServer(config, args.host, 0 if args.bench else args.port)
+    if args.bench:
+        server.start()
+        try:
+            ok = run_benchmark(server, args.bench, workers=args.workers,
+                               deadline=args.deadline, cold=args.cold)
+        finally:
+            server.stop()
+        sys.exit(0 if ok else 1)
+
+    logger.info(f"Serving mock KB articles on {server.base_url}")
+    logger.info(f"Run: python vmware_tools_scraper.py --base-url {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
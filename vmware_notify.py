@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+VMware Versions Change Notifier
+Computes structured change events between two scraper results and pushes them
+to webhook URLs, a local Unix socket or a command hook, so consumers do not
+have to poll vmware-versions.json.
+"""
+
+import json
+import logging
+import os
+import socket
+import subprocess
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import requests
+
+from vmware_release import iter_product_entries
+
+logger = logging.getLogger(__name__)
+
+
+def compute_change_events(old_result: Optional[Dict], new_result: Dict) -> List[Dict]:
+    """
+    Compare two scraper results and return one event per product whose build
+    number changed (including products that appear for the first time).
+
+    Products missing from new_result are not reported; a failed scrape is not
+    a release.
+
+    Args:
+        old_result: Previous vmware-versions.json content (may be None)
+        new_result: Freshly scraped result
+
+    Returns:
+        List of change event dicts
+    """
+    old_products = {key: data for _, key, data in iter_product_entries(old_result)}
+    detected_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    events = []
+    for _, key, new in iter_product_entries(new_result):
+        old = old_products.get(key, {})
+        if not new.get("BuildNumber") or old.get("BuildNumber") == new.get("BuildNumber"):
+            continue
+        events.append({
+            "ProductKey": key,
+            "OldBuild": old.get("BuildNumber"),
+            "NewBuild": new.get("BuildNumber"),
+            "OldVersion": old.get("Version"),
+            "NewVersion": new.get("Version"),
+            "ReleaseDate": new.get("ReleaseDate"),
+            "DetectedAt": detected_at
+        })
+    return events
+
+
+class ChangeNotifier:
+    """
+    Dispatches change events with batching, debounce and a persistent retry queue.
+
+    Pending events and failed deliveries are kept in a JSON queue file so that
+    they survive between scraper runs. Events for the same product that arrive
+    within the debounce window are coalesced into a single old -> new event.
+    """
+
+    def __init__(self, webhooks: Optional[List[str]] = None,
+                 socket_path: Optional[str] = None,
+                 command: Optional[str] = None,
+                 queue_path: str = "vmware-notify-queue.json",
+                 batch_size: int = 50,
+                 debounce: float = 0.0,
+                 max_attempts: int = 8,
+                 timeout: float = 10.0):
+        self.targets = [("webhook", url) for url in (webhooks or [])]
+        if socket_path:
+            self.targets.append(("socket", socket_path))
+        if command:
+            self.targets.append(("command", command))
+        self.queue_path = Path(queue_path)
+        self.batch_size = max(1, batch_size)
+        self.debounce = debounce
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+
+    @property
+    def enabled(self) -> bool:
+        """True if at least one delivery target is configured."""
+        return bool(self.targets)
+
+    def _load_queue(self) -> Dict:
+        try:
+            with open(self.queue_path, "r", encoding="utf-8") as f:
+                queue = json.load(f)
+        except FileNotFoundError:
+            queue = {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable notify queue {self.queue_path}: {e}")
+            queue = {}
+        queue.setdefault("pending", {})
+        queue.setdefault("retry", [])
+        return queue
+
+    def _save_queue(self, queue: Dict) -> None:
+        tmp_path = self.queue_path.with_name(f"{self.queue_path.name}.tmp.{os.getpid()}")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(queue, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.queue_path)
+        except OSError as e:
+            logger.error(f"Error saving notify queue {self.queue_path}: {e}")
+
+    def enqueue(self, events: List[Dict]) -> Optional[Dict]:
+        """
+        Add events to the pending set, coalescing with any pending event for
+        the same product key. An event that flips back to the original build
+        cancels out.
+
+        Args:
+            events: Change events from compute_change_events()
+
+        Returns:
+            The updated queue, or None if nothing was queued
+        """
+        if not self.enabled or not events:
+            return None
+        queue = self._load_queue()
+        pending = queue["pending"]
+        now = time.time()
+        for event in events:
+            key = event["ProductKey"]
+            previous = pending.get(key)
+            if previous:
+                event = dict(event, OldBuild=previous["event"]["OldBuild"],
+                             OldVersion=previous["event"]["OldVersion"])
+            if event["OldBuild"] is not None and event["OldBuild"] == event["NewBuild"]:
+                pending.pop(key, None)
+                continue
+            pending[key] = {"event": event, "changed_at": now}
+        self._save_queue(queue)
+        return queue
+
+    def flush(self, queue: Optional[Dict] = None) -> int:
+        """
+        Deliver settled pending events and due retries to every target.
+
+        Args:
+            queue: Queue returned by enqueue() (default: load the queue file),
+                so events are delivered even if the queue could not be saved
+
+        Returns:
+            Number of batches delivered successfully
+        """
+        if not self.enabled:
+            return 0
+        if queue is None:
+            queue = self._load_queue()
+        now = time.time()
+
+        settled = [key for key, item in queue["pending"].items()
+                   if now - item["changed_at"] >= self.debounce]
+        events = [queue["pending"].pop(key)["event"] for key in sorted(settled)]
+        for i in range(0, len(events), self.batch_size):
+            batch = events[i:i + self.batch_size]
+            for kind, target in self.targets:
+                queue["retry"].append({"kind": kind, "target": target, "events": batch,
+                                       "attempts": 0, "next_attempt": now})
+
+        delivered = 0
+        remaining = []
+        for item in queue["retry"]:
+            if item["next_attempt"] > now:
+                remaining.append(item)
+                continue
+            if self._deliver(item["kind"], item["target"], item["events"]):
+                delivered += 1
+                continue
+            item["attempts"] += 1
+            if item["attempts"] >= self.max_attempts:
+                logger.error(f"Dropping {len(item['events'])} change event(s) for "
+                             f"{item['kind']} {item['target']} after {item['attempts']} attempts")
+                continue
+            item["next_attempt"] = now + min(3600, 30 * 2 ** (item["attempts"] - 1))
+            remaining.append(item)
+        queue["retry"] = remaining
+
+        self._save_queue(queue)
+        if delivered:
+            logger.info(f"Delivered {delivered} change notification batch(es)")
+        if remaining:
+            logger.warning(f"{len(remaining)} change notification batch(es) queued for retry")
+        return delivered
+
+    def notify(self, old_result: Optional[Dict], new_result: Dict) -> List[Dict]:
+        """
+        Compute change events between two results, queue and flush them.
+
+        Returns:
+            The change events that were computed
+        """
+        events = compute_change_events(old_result, new_result)
+        self.dispatch(events)
+        return events
+
+    def dispatch(self, events: List[Dict]) -> None:
+        """Queue already computed change events and flush them."""
+        for event in events:
+            logger.info(f"Change detected for {event['ProductKey']}: "
+                        f"{event['OldBuild']} -> {event['NewBuild']}")
+        if self.enabled:
+            self.flush(self.enqueue(events))
+
+    def _deliver(self, kind: str, target: str, events: List[Dict]) -> bool:
+        payload = json.dumps({"events": events}, ensure_ascii=False).encode("utf-8")
+        try:
+            if kind == "webhook":
+                response = requests.post(target, data=payload, timeout=self.timeout,
+                                         headers={"Content-Type": "application/json"})
+                response.raise_for_status()
+            elif kind == "socket":
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                    sock.settimeout(self.timeout)
+                    sock.connect(target)
+                    sock.sendall(payload + b"\n")
+            elif kind == "command":
+                subprocess.run(target, shell=True, input=payload, check=True,
+                               timeout=self.timeout, capture_output=True)
+            return True
+        except (requests.RequestException, OSError, subprocess.SubprocessError) as e:
+            logger.warning(f"Failed to deliver change events to {kind} {target}: {e}")
+            return False
+
+
+def serve_receiver(port: int = 8765, socket_path: Optional[str] = None) -> None:
+    """
+    Run a local stand-in receiver that prints every payload it gets, either as
+    an HTTP webhook endpoint on 127.0.0.1:port or on a Unix socket.
+    """
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(socket_path)
+            server.listen()
+            logger.info(f"Listening for change events on {socket_path}")
+            while True:
+                conn, _ = server.accept()
+                with conn, conn.makefile("rb") as stream:
+                    for line in stream:
+                        print(line.decode("utf-8").rstrip(), flush=True)
+        return
+
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            print(body.decode("utf-8"), flush=True)
+            self.send_response(204)
+            self.end_headers()
+
+    logger.info(f"Listening for change events on http://127.0.0.1:{port}/")
+    HTTPServer(("127.0.0.1", port), Handler).serve_forever()
+
+
+def main():
+    """Run a local stand-in receiver for testing change notifications."""
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description='VMware Versions change event receiver')
+    parser.add_argument('--port', type=int, default=8765,
+                        help='HTTP port to listen on (default: 8765)')
+    parser.add_argument('--socket', default=None,
+                        help='Listen on this Unix socket path instead of HTTP')
+    args = parser.parse_args()
+    try:
+        serve_receiver(args.port, args.socket)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+VMware Versions Output Renderers
+Renders the scraper's in-memory result as CSV, Markdown and an Atom feed,
+and writes any set of rendered outputs concurrently and atomically, skipping
+files whose content did not change.
+"""
+
+import csv
+import io
+import logging
+import os
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+from xml.sax.saxutils import escape
+
+from vmware_release import Release, iter_product_entries
+
+logger = logging.getLogger(__name__)
+
+ATOM_NS = "http://www.w3.org/2005/Atom"
+# Feed <updated> used before any change has been recorded.
+ATOM_EPOCH = "1970-01-01T00:00:00+00:00"
+
+# JSON section -> display name.
+SECTIONS = {"VMwareTools": "VMware Tools", "ESXi": "ESXi", "vCenter": "vCenter Server"}
+
+CSV_COLUMNS = ["Product", "ProductKey", "Version", "ReleaseName", "ReleaseDate",
+               "BuildNumber", "AvailableAs", "ToolInternalVersion", "Stale"]
+
+
+def iter_products(model: Dict):
+    """
+    Yield (section display name, Release, stale) for every product in a
+    result, in dashboard order.
+    """
+    for section, key, product in iter_product_entries(model):
+        # Per-source stale markers live on the section, not the product.
+        stale = bool(model[section].get("Stale", False))
+        yield SECTIONS[section], Release.from_dict(key, product), stale
+
+
+def render_csv(model: Dict) -> str:
+    """
+    Render one row per product. Run timestamps are left out so the file only
+    changes when a release does.
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS, extrasaction="ignore",
+                            lineterminator="\n")
+    writer.writeheader()
+    for name, release, stale in iter_products(model):
+        writer.writerow(dict(release.to_dict(), Product=name, ProductKey=release.product_key,
+                             Stale="yes" if stale else ""))
+    return buffer.getvalue()
+
+
+def render_markdown(model: Dict) -> str:
+    """Render a Markdown table per product family, for wikis."""
+    lines = ["# VMware by Broadcom Versions", ""]
+    current = None
+    for name, release, stale in iter_products(model):
+        if name != current:
+            if current is not None:
+                lines.append("")
+            lines += [f"## {name}", "",
+                      "| Product | Version | Release Name | Release Date | Build |",
+                      "| --- | --- | --- | --- | --- |"]
+            current = name
+        cells = [release.product_key, release.version, release.release_name or "",
+                 release.release_date, release.build_number]
+        suffix = " (stale)" if stale else ""
+        lines.append("| " + " | ".join(str(c).replace("|", "\\|") for c in cells) + f"{suffix} |")
+    lines.append("")
+    return "\n".join(lines)
+
+
+def _rfc3339(timestamp: str) -> str:
+    """Convert the scraper's local "YYYY-mm-dd HH:MM:SS" stamps to RFC 3339."""
+    try:
+        moment = datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S")
+    except (TypeError, ValueError):
+        moment = datetime.now()
+    return moment.astimezone().isoformat(timespec="seconds")
+
+
+def _existing_entries(feed_xml: Optional[str]) -> List[Dict[str, str]]:
+    if not feed_xml:
+        return []
+    try:
+        root = ET.fromstring(feed_xml)
+    except ET.ParseError as e:
+        logger.warning(f"Ignoring unparseable existing Atom feed: {e}")
+        return []
+    entries = []
+    for entry in root.findall(f"{{{ATOM_NS}}}entry"):
+        entries.append({tag: entry.findtext(f"{{{ATOM_NS}}}{tag}", "")
+                        for tag in ("id", "title", "updated", "summary")})
+    return entries
+
+
+def _existing_updated(feed_xml: Optional[str]) -> Optional[str]:
+    if not feed_xml:
+        return None
+    try:
+        return ET.fromstring(feed_xml).findtext(f"{{{ATOM_NS}}}updated") or None
+    except ET.ParseError:
+        return None
+
+
+def render_atom(events: List[Dict], existing_feed: Optional[str] = None,
+                feed_url: str = "vmware-versions.atom", max_entries: int = 50) -> str:
+    """
+    Render an Atom feed with one entry per build change.
+
+    New entries are prepended to those already in existing_feed. The feed's
+    <updated> is the newest entry's timestamp (or, with no entries, the existing
+    feed's <updated> or the Unix epoch), so the document is byte-for-byte
+    identical when nothing changed and can be served for cheap conditional GETs.
+
+    Args:
+        events: Change events from vmware_notify.compute_change_events()
+        existing_feed: Current feed XML, if any
+        feed_url: Value for the feed's self link
+        max_entries: Maximum number of entries kept
+
+    Returns:
+        Atom XML document
+    """
+    new_entries = []
+    for event in events:
+        summary = (f"Build {event['OldBuild']} -> {event['NewBuild']}"
+                   if event.get("OldBuild") else f"Build {event['NewBuild']}")
+        if event.get("ReleaseDate"):
+            summary += f", released {event['ReleaseDate']}"
+        new_entries.append({
+            "id": f"urn:vmware-versions:{event['ProductKey']}:{event['NewBuild']}",
+            "title": f"{event['ProductKey']}: {event.get('NewVersion') or ''} (build {event['NewBuild']})",
+            "updated": _rfc3339(event.get("DetectedAt")),
+            "summary": summary
+        })
+    new_ids = {entry["id"] for entry in new_entries}
+    entries = new_entries + [e for e in _existing_entries(existing_feed) if e["id"] not in new_ids]
+    entries = entries[:max_entries]
+    updated = max((e["updated"] for e in entries),
+                  default=_existing_updated(existing_feed) or ATOM_EPOCH)
+
+    lines = ['<?xml version="1.0" encoding="utf-8"?>',
+             f'<feed xmlns="{ATOM_NS}">',
+             '  <title>VMware by Broadcom Versions</title>',
+             '  <id>urn:vmware-versions:feed</id>',
+             f'  <link rel="self" href="{escape(feed_url)}"/>',
+             f'  <updated>{updated}</updated>',
+             '  <author><name>VMware Versions Scraper</name></author>']
+    for entry in entries:
+        lines += ['  <entry>',
+                  f'    <id>{escape(entry["id"])}</id>',
+                  f'    <title>{escape(entry["title"])}</title>',
+                  f'    <updated>{entry["updated"]}</updated>',
+                  f'    <summary>{escape(entry["summary"])}</summary>',
+                  '  </entry>']
+    lines.append('</feed>')
+    return "\n".join(lines) + "\n"
+
+
+def read_text(path: str) -> Optional[str]:
+    """Read a text file, or None if it does not exist or cannot be read."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def write_atomic(path: str, content: str) -> bool:
+    """
+    Write content to path via a temporary file and rename, so readers never
+    see a partially written file. Skips the write if path already holds
+    exactly this content.
+
+    Returns:
+        True if the file was written, False if it was unchanged
+    """
+    data = content.encode("utf-8")
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+    return True
+
+
+def write_outputs(outputs: Dict[str, str], max_workers: int = 4) -> Dict[str, Optional[bool]]:
+    """
+    Write several rendered outputs concurrently.
+
+    Args:
+        outputs: Dict mapping file path to rendered content
+        max_workers: Maximum concurrent writes
+
+    Returns:
+        Dict mapping path to True (written), False (unchanged) or None (failed)
+    """
+    def write(item):
+        path, content = item
+        try:
+            return path, write_atomic(path, content)
+        except OSError as e:
+            logger.error(f"Error writing {path}: {e}")
+            return path, None
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(outputs)))) as pool:
+        return dict(pool.map(write, outputs.items()))
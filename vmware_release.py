@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+VMware Release Record
+The single typed record for one product's latest release, shared by the
+extractors, the renderers and the client API.
+"""
+
+from dataclasses import dataclass, fields as fields_of
+from typing import Dict, Iterator, Optional, Tuple
+
+# VMware Tools is a single product at the top level of vmware-versions.json; the
+# other sections hold one entry per product key (e.g. "ESXi" -> {"ESXi_8_0": {...}}).
+TOOLS_KEY = "VMwareTools"
+PRODUCT_SECTIONS = ("ESXi", "vCenter")
+
+# Attribute name -> key in vmware-versions.json, in output order.
+_JSON_KEYS = (
+    ("version", "Version"),
+    ("release_name", "ReleaseName"),
+    ("release_date", "ReleaseDate"),
+    ("build_number", "BuildNumber"),
+    ("available_as", "AvailableAs"),
+    ("tool_internal_version", "ToolInternalVersion"),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Release:
+    """
+    Latest release of one product (e.g. "ESXi_8_0" or "VMwareTools").
+
+    Only version, release_date and build_number are always present; the other
+    fields exist for some products only (ReleaseName is missing for vCenter
+    9.x, AvailableAs is ESXi only, ToolInternalVersion is VMware Tools only).
+    Instances are immutable and use __slots__, so they are cheap to create and
+    hold in bulk.
+    """
+
+    product_key: str
+    version: str
+    release_date: str
+    build_number: str
+    release_name: Optional[str] = None
+    available_as: Optional[str] = None
+    tool_internal_version: Optional[str] = None
+
+    def __repr__(self):
+        fields = ", ".join(f"{f.name}={getattr(self, f.name)!r}" for f in fields_of(self)
+                           if getattr(self, f.name) is not None)
+        return f"Release({fields})"
+
+    def __str__(self):
+        # Used for structured log lines: key=value pairs, only for set fields.
+        # Formatting happens only when a log record is actually emitted.
+        parts = [f"product={self.product_key}"]
+        parts += [f"{attr}={getattr(self, attr)!r}" for attr, _ in _JSON_KEYS
+                  if getattr(self, attr) is not None]
+        return " ".join(parts)
+
+    def to_dict(self) -> Dict[str, str]:
+        """Serialize to the vmware-versions.json product layout, omitting unset fields."""
+        result = {}
+        for attr, key in _JSON_KEYS:
+            value = getattr(self, attr)
+            if value is not None:
+                result[key] = value
+        return result
+
+    @classmethod
+    def from_dict(cls, product_key: str, data: Dict) -> "Release":
+        """Build a Release from a vmware-versions.json product entry."""
+        return cls(product_key,
+                   version=data.get("Version", ""),
+                   release_date=data.get("ReleaseDate", ""),
+                   build_number=str(data.get("BuildNumber", "")),
+                   release_name=data.get("ReleaseName"),
+                   available_as=data.get("AvailableAs"),
+                   tool_internal_version=data.get("ToolInternalVersion"))
+
+
+def iter_product_entries(result: Dict) -> Iterator[Tuple[str, str, Dict]]:
+    """
+    Yield (section, product key, product dict) for every product of a result in
+    the vmware-versions.json layout, VMware Tools first. Entries without a
+    Version are not releases and are skipped.
+    """
+    tools = (result or {}).get(TOOLS_KEY)
+    if isinstance(tools, dict) and tools.get("Version"):
+        yield TOOLS_KEY, TOOLS_KEY, tools
+    for section in PRODUCT_SECTIONS:
+        for key, data in ((result or {}).get(section) or {}).items():
+            if isinstance(data, dict) and data.get("Version"):
+                yield section, key, data
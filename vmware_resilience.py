@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Resilience helpers for the VMware versions scraper: a run-wide deadline that
+is split across sources and a per-host circuit breaker whose state survives
+between runs.
+"""
+
+import time
+from typing import Dict, Optional
+
+import requests
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of making a request while a host's circuit is open."""
+
+
+class Deadline:
+    """
+    Run-wide time budget.
+
+    Each source asks for its share of the remaining budget, so a slow early
+    source cannot starve the later ones of all their time, and time left over
+    by fast sources is passed on.
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline (never negative)."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def share(self, parts: int, cap: Optional[float] = None) -> float:
+        """
+        Get an even share of the remaining budget.
+
+        Args:
+            parts: Number of sources still to be fetched, including this one
+            cap: Optional upper bound for the share (e.g. a per-request timeout)
+
+        Returns:
+            Seconds this source may spend
+        """
+        share = self.remaining() / max(1, parts)
+        return min(share, cap) if cap is not None else share
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker.
+
+    After `threshold` consecutive failures the circuit opens and requests fail
+    fast for `cooldown` seconds. After that a single trial request is allowed
+    (half-open); success closes the circuit, failure re-opens it.
+    State uses wall-clock time so it can be persisted between runs.
+    """
+
+    def __init__(self, host: str, threshold: int = 3, cooldown: float = 900.0,
+                 failures: int = 0, opened_at: Optional[float] = None):
+        self.host = host
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = failures
+        self.opened_at = opened_at
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.time() - self.opened_at >= self.cooldown:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        """True if a request to this host may be attempted now."""
+        return self.state != "open"
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == "half-open" or self.failures >= self.threshold:
+            self.opened_at = time.time()
+
+    def to_dict(self) -> Dict:
+        return {"failures": self.failures, "opened_at": self.opened_at}
+
+
+class CircuitBreakerRegistry:
+    """Circuit breakers keyed by host, loadable from and savable to a dict."""
+
+    def __init__(self, threshold: int = 3, cooldown: float = 900.0,
+                 state: Optional[Dict] = None):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        for host, data in (state or {}).items():
+            self._breakers[host] = CircuitBreaker(host, threshold, cooldown,
+                                                  failures=data.get("failures", 0),
+                                                  opened_at=data.get("opened_at"))
+
+    def get(self, host: str) -> CircuitBreaker:
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = self._breakers[host] = CircuitBreaker(host, self.threshold, self.cooldown)
+        return breaker
+
+    def to_dict(self) -> Dict:
+        return {host: breaker.to_dict() for host, breaker in self._breakers.items()}
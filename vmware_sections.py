@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+VMware KB Section Discovery
+Classifies the <h3> sections of the ESXi and vCenter build-number articles by
+product and major.minor version, and maps each section's table columns to
+Release fields from its header row. A new major version (e.g. "ESX 9.2") is
+picked up as soon as Broadcom adds its section, without code changes.
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+# Product -> heading pattern. Only plain "<name> <major>.<minor>" headings
+# match; archive sections such as "vCenter Server 6.7 (Windows)" or
+# "vCenter Server 6.5 and older" do not. Group 1 is the key prefix.
+HEADING_PATTERNS = {
+    "esxi": re.compile(r'^(ESXi?)\s+(\d+)\.(\d+)$'),
+    "vcenter": re.compile(r'^(vCenter)(?:\s+Server)?\s+(\d+)\.(\d+)$'),
+}
+
+# (Release field, header pattern). Each header cell is assigned to the first
+# field that matches it and has no column yet, so "VAMI / Release Notes" is the
+# build number and a later "MOB / vpxd.log" column is ignored.
+COLUMN_PATTERNS = [
+    ("release_name", re.compile(r'release\s+name', re.IGNORECASE)),
+    ("release_date", re.compile(r'date', re.IGNORECASE)),
+    ("build_number", re.compile(r'build|vami', re.IGNORECASE)),
+    ("available_as", re.compile(r'available', re.IGNORECASE)),
+    ("version", re.compile(r'^version', re.IGNORECASE)),
+]
+
+REQUIRED_FIELDS = ("version", "release_date", "build_number")
+
+# Positional layouts used when a table has no recognizable header row, widest
+# first; the first one that fits the row's cell count is used.
+DEFAULT_LAYOUTS = {
+    "esxi": [("version", "release_name", "release_date", "build_number", "available_as")],
+    "vcenter": [("release_name", "version", "release_date", "build_number"),
+                ("version", "release_date", "build_number")],
+}
+
+DEFAULT_MIN_VERSION = "7.0"
+
+
+def parse_min_version(text: str) -> Tuple[int, int]:
+    """
+    Parse a "major.minor" (or "major") minimum version.
+
+    Raises:
+        ValueError: If text is not a version
+    """
+    match = re.fullmatch(r'\s*(\d+)(?:\.(\d+))?\s*', str(text))
+    if not match:
+        raise ValueError(f"Invalid minimum version {text!r}; expected e.g. 7.0")
+    return int(match.group(1)), int(match.group(2) or 0)
+
+
+def classify_heading(product: str, heading: str) -> Optional[Tuple[str, Tuple[int, int]]]:
+    """
+    Classify a section heading.
+
+    Args:
+        product: "esxi" or "vcenter"
+        heading: Heading text from _split_sections()
+
+    Returns:
+        (product key, (major, minor)), e.g. ("ESXi_8_0", (8, 0)), or None if
+        the heading is not a version section of that product
+    """
+    match = HEADING_PATTERNS[product].match(heading)
+    if not match:
+        return None
+    name, major, minor = match.group(1), int(match.group(2)), int(match.group(3))
+    return f"{name}_{major}_{minor}", (major, minor)
+
+
+def discover_sections(product: str, headings, min_version: Tuple[int, int]) -> List[Tuple[str, str]]:
+    """
+    Find the version sections of a product, in page order.
+
+    Args:
+        product: "esxi" or "vcenter"
+        headings: Section headings, in page order
+        min_version: Oldest (major, minor) to track
+
+    Returns:
+        List of (product key, heading). If two headings map to the same key,
+        the first one wins.
+    """
+    found = {}
+    for heading in headings:
+        classified = classify_heading(product, heading)
+        if classified and classified[1] >= min_version:
+            found.setdefault(classified[0], heading)
+    return [(key, heading) for key, heading in found.items()]
+
+
+def map_columns(product: str, header: Optional[List[str]], cell_count: int) -> Optional[Dict[str, int]]:
+    """
+    Map Release fields to column indexes.
+
+    Args:
+        product: "esxi" or "vcenter"
+        header: Header cell texts of the section's table, if any
+        cell_count: Number of cells in the first data row
+
+    Returns:
+        Dict mapping Release field names to column indexes, or None if the
+        required fields cannot be located
+    """
+    columns: Dict[str, int] = {}
+    for index, label in enumerate((header or [])[:cell_count]):
+        for field, pattern in COLUMN_PATTERNS:
+            if field not in columns and pattern.search(label):
+                columns[field] = index
+                break
+    if all(field in columns for field in REQUIRED_FIELDS):
+        return columns
+
+    for layout in DEFAULT_LAYOUTS[product]:
+        if len(layout) <= cell_count:
+            return {field: index for index, field in enumerate(layout)}
+    return None
+
+
+def display_name(product_key: str) -> str:
+    """Turn a product key into a heading, e.g. "ESX_9_1" -> "ESX 9.1"."""
+    name, _, version = product_key.partition("_")
+    return f"{name} {version.replace('_', '.')}" if version else name
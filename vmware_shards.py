@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+VMware Versions Sharding and Locking
+Lets several scraper processes (on one machine or several sharing a
+directory) split the sources between them. Each shard worker writes one
+partial result per source, and a merge step combines the newest partials and
+publishes the outputs while holding a lock file, so overlapping runs never
+interleave their writes or publish older data over newer data.
+"""
+
+import fcntl
+import json
+import logging
+import os
+import socket
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from vmware_outputs import write_atomic
+
+logger = logging.getLogger(__name__)
+
+
+class LockTimeoutError(TimeoutError):
+    """Raised when a FileLock cannot be acquired in time."""
+
+
+class FileLock:
+    """
+    Inter-process lock held with flock() on a lock file that is never deleted.
+
+    The kernel drops the lock when its holder exits, crashed or not, so there
+    are no stale locks to detect or break. On NFS, Linux maps flock() to
+    byte-range locks that the server arbitrates between clients. The holder's
+    host, PID and start time are written into the file for diagnostics only.
+    """
+
+    def __init__(self, path: str, timeout: float = 120.0, poll_interval: float = 0.2):
+        self.path = path
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._fd: Optional[int] = None
+
+    def acquire(self) -> None:
+        """
+        Raises:
+            LockTimeoutError: If the lock is still held by another process after timeout seconds
+        """
+        fd = os.open(self.path, os.O_CREAT | os.O_RDWR, 0o644)
+        give_up = time.monotonic() + self.timeout
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if time.monotonic() >= give_up:
+                    os.close(fd)
+                    raise LockTimeoutError(f"Timed out waiting for lock {self.path}") from None
+                time.sleep(self.poll_interval)
+            except OSError:
+                os.close(fd)
+                raise
+        self._fd = fd
+        try:
+            os.ftruncate(fd, 0)
+            os.write(fd, f"{socket.gethostname()} {os.getpid()} {time.time():.0f}\n".encode())
+        except OSError as e:
+            logger.debug(f"Could not record lock holder in {self.path}: {e}")
+
+    def release(self) -> None:
+        if self._fd is not None:
+            fd, self._fd = self._fd, None
+            # Closing the descriptor drops the lock; the file stays in place.
+            os.close(fd)
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+
+def parse_shard(text: str) -> Tuple[int, int]:
+    """
+    Parse a "K/N" shard spec (1-based).
+
+    Raises:
+        ValueError: If text is not a valid spec
+    """
+    try:
+        index, count = (int(part) for part in text.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard {text!r}; expected K/N, e.g. 1/3") from None
+    if not 1 <= index <= count:
+        raise ValueError(f"Invalid shard {text!r}; K must be between 1 and N")
+    return index, count
+
+
+def shard_sources(sources: List, shard: Optional[Tuple[int, int]]) -> List:
+    """Return the sources assigned to shard (every Nth source, starting at the Kth)."""
+    if not shard:
+        return list(sources)
+    index, count = shard
+    return list(sources)[index - 1::count]
+
+
+def shard_path(path: Optional[str], shard: Optional[Tuple[int, int]]) -> Optional[str]:
+    """
+    Give a per-worker file (state, parse cache) a per-shard name, e.g.
+    "vmware-scraper-state.json" -> "vmware-scraper-state.shard-1-of-3.json".
+    """
+    if not path or not shard:
+        return path
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.shard-{shard[0]}-of-{shard[1]}{ext}"
+
+
+def section_time(section: Optional[Dict]) -> float:
+    """Epoch time of a section's LastUpdated stamp, or 0 if it has none."""
+    try:
+        return datetime.strptime(section["LastUpdated"], "%Y-%m-%d %H:%M:%S").timestamp()
+    except (TypeError, KeyError, ValueError):
+        return 0.0
+
+
+def write_partial(partials_dir: str, source: str, section: str, result: Dict,
+                  worker_id: Optional[str] = None) -> str:
+    """
+    Atomically write one source's result as a partial for a later merge.
+    Each worker has its own file per source, so workers never write the same file.
+
+    Returns:
+        Path of the partial
+    """
+    worker_id = worker_id or socket.gethostname()
+    Path(partials_dir).mkdir(parents=True, exist_ok=True)
+    path = os.path.join(partials_dir, f"{source}.{worker_id}.json")
+    write_atomic(path, json.dumps({"Source": source, "Section": section, "Worker": worker_id,
+                                   "Result": result}, indent=2, ensure_ascii=False))
+    return path
+
+
+def load_partials(partials_dir: str, max_age: Optional[float] = None) -> Dict[str, Dict]:
+    """
+    Load the newest partial result per section.
+
+    Args:
+        partials_dir: Directory the shard workers write to
+        max_age: Ignore partials whose LastUpdated is older than this many seconds
+
+    Returns:
+        Dict mapping JSON section to the newest partial result
+    """
+    newest: Dict[str, Dict] = {}
+    now = time.time()
+    for path in sorted(Path(partials_dir).glob("*.json")):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                partial = json.load(f)
+            section, result = partial["Section"], partial["Result"]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable partial {path}: {e}")
+            continue
+        scraped_at = section_time(result)
+        if max_age is not None and now - scraped_at > max_age:
+            logger.warning(f"Ignoring partial {path}: older than {max_age:.0f}s")
+            continue
+        if scraped_at >= section_time(newest.get(section)):
+            newest[section] = result
+    return newest
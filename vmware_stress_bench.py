@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+VMware KB Page Stress Generator and Parser Benchmarks
+Synthesizes Broadcom KB-style articles of arbitrary size (optionally with
+deeply nested cells and deliberately unclosed tags) and times the scraper's
+_extract_* functions over them, checking that parse time grows roughly
+linearly with page size and stays under a hard cap per page. A second
+benchmark compares decoding whole pages via response.text with parsing the
+raw response bytes.
+"""
+
+import logging
+import os
+import random
+import sys
+import time
+import tracemalloc
+from typing import List, Optional, Tuple
+
+import requests
+
+from vmware_tools_scraper import VMwareVersionScraper
+
+logger = logging.getLogger(__name__)
+
+# Tracked headings and table columns per article kind, mirroring the real pages.
+LAYOUTS = {
+    "tools": {
+        "headings": ["VMware Tools 13.x", "VMware Tools 12.x"],
+        "columns": ["Version", "Release Date", "Build Number", "Internal Tools Version"],
+    },
+    "esxi": {
+        "headings": ["ESX 9.1", "ESX 9.0", "ESXi 8.0", "ESXi 7.0"],
+        "columns": ["Version", "Release Name", "Release Date", "Build Number", "Available as"],
+    },
+    "vcenter": {
+        "headings": ["vCenter 9.1", "vCenter 9.0", "vCenter Server 8.0", "vCenter Server 7.0"],
+        "columns": ["Release name", "Version", "Release Date", "Build / Release Notes", "MOB / vpxd.log"],
+    },
+}
+# vCenter 9.x tables only have Version | Release Date | Build.
+_VCENTER_9_COLUMNS = ["Version", "Release Date", "Build Number"]
+
+EXTRACTORS = {
+    "tools": "_extract_tools_version_data",
+    "esxi": "_extract_esxi_version_data",
+    "vcenter": "_extract_vcenter_version_data",
+}
+
+
+def _cell_value(column: str, heading: str, row: int, rng: random.Random) -> str:
+    name = column.lower()
+    major = heading.split()[-1].rstrip("x").rstrip(".") or "13"
+    if "date" in name:
+        return f"{rng.randint(2015, 2026)}/{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}"
+    if "build" in name or "mob" in name:
+        return str(rng.randint(1_000_000, 30_000_000))
+    if "internal" in name:
+        return str(rng.randint(10000, 13400))
+    if "available" in name:
+        return rng.choice(["ISO", "Patch"])
+    if "release name" in name:
+        return f"{heading} Update {rng.randint(1, 3)}{chr(ord('a') + row % 26)}"
+    return f"{heading.split()[0]} {major}.{rng.randint(0, 3)}.{row:04d}"
+
+
+def _wrap(text: str, nesting: int) -> str:
+    for depth in range(nesting):
+        tag = "span" if depth % 2 else "div"
+        text = f"<{tag} class=\"n{depth}\">{text}</{tag}>"
+    return text
+
+
+def _close(tag: str, unclosed: float, rng: random.Random) -> str:
+    return "" if unclosed and rng.random() < unclosed else f"</{tag}>"
+
+
+def generate_section(kind: str, heading: str, rows: int, nesting: int = 0,
+                     unclosed: float = 0.0, rng: Optional[random.Random] = None) -> str:
+    """
+    Generate one <h3> heading and its version table.
+
+    Args:
+        kind: "tools", "esxi" or "vcenter"
+        heading: Heading text (e.g. "ESXi 8.0")
+        rows: Number of data rows
+        nesting: Depth of <div>/<span> wrappers around each cell's text
+        unclosed: Probability that a closing tag is dropped
+        rng: Random source
+
+    Returns:
+        HTML fragment
+    """
+    rng = rng or random.Random(0)
+    columns = _VCENTER_9_COLUMNS if heading.startswith("vCenter 9") else LAYOUTS[kind]["columns"]
+    parts = [f'<p>&nbsp;</p><h3 id="mcetoc_{rng.getrandbits(40):x}"><u>{heading}</u>'
+             f'<a href="#mcetoc_table_of_contents"> \U0001f51d</a>{_close("h3", unclosed, rng)}',
+             '<table style="border-collapse: collapse; width: 850px;" border="1">'
+             '<thead style="background-color: lightgrey;"><tr>']
+    parts.extend(f"<th>{column}</th>" for column in columns)
+    parts.append("</tr></thead><tbody>")
+    for row in range(rows):
+        parts.append("<tr>")
+        for column in columns:
+            value = _cell_value(column, heading, row, rng)
+            if "release" in column.lower():
+                value = f'<a href="https://techdocs.broadcom.com/release-notes/{row}.html" target="_blank">{value}</a>'
+            parts.append(f"<td>{_wrap(value, nesting)}{_close('td', unclosed, rng)}")
+        parts.append(_close("tr", unclosed, rng))
+    parts.append(f"</tbody>{_close('table', unclosed, rng)}")
+    return "".join(parts)
+
+
+def generate_article(kind: str, sections: int = 8, rows: int = 20, nesting: int = 0,
+                     unclosed: float = 0.0, seed: int = 0) -> str:
+    """
+    Generate a KB-style article. The tracked headings for kind come first
+    (newest release first, like the real pages), followed by filler sections
+    for older releases.
+
+    Args:
+        kind: "tools", "esxi" or "vcenter"
+        sections: Total number of sections (at least the tracked ones are emitted)
+        rows: Data rows per table
+        nesting: Depth of wrapper elements around each cell's text
+        unclosed: Probability that a closing tag is dropped
+        seed: Random seed, so pages are reproducible
+
+    Returns:
+        Complete HTML document
+    """
+    rng = random.Random(seed)
+    headings = list(LAYOUTS[kind]["headings"])
+    prefix = headings[-1].rsplit(" ", 1)[0]
+    for i in range(max(0, sections - len(headings))):
+        headings.append(f"{prefix} {6 - i // 10}.{i % 10} (archived {i})")
+    body = "".join(generate_section(kind, heading, rows, nesting, unclosed, rng)
+                   for heading in headings)
+    return (f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{kind} builds</title></head>'
+            f'<body><h3 class="wolken-h3">Build numbers and versions ({kind})</h3>{body}</body></html>')
+
+
+def generate_to_size(kind: str, target_bytes: int, rows: int = 50, nesting: int = 0,
+                     unclosed: float = 0.0, seed: int = 0) -> str:
+    """
+    Generate an article of roughly target_bytes by scaling the section count.
+
+    Returns:
+        HTML document of approximately the requested size
+    """
+    sample = generate_section(kind, LAYOUTS[kind]["headings"][-1], rows, nesting, unclosed,
+                              random.Random(seed))
+    sections = max(len(LAYOUTS[kind]["headings"]), target_bytes // max(1, len(sample)))
+    return generate_article(kind, sections, rows, nesting, unclosed, seed)
+
+
+def time_extract(kind: str, content: bytes, repeat: int = 3) -> float:
+    """
+    Time the matching _extract_* function on content (best of repeat runs).
+    A fresh scraper without parse cache is used for each run so memoization
+    does not hide the parsing cost.
+
+    Returns:
+        Seconds for the fastest run
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        scraper = VMwareVersionScraper(parse_cache_path=None, state_path=None)
+        extract = getattr(scraper, EXTRACTORS[kind])
+        start = time.perf_counter()
+        extract(content)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmark(sizes: List[int], kinds: List[str], cap: float = 10.0,
+                  tolerance: float = 3.0, nesting: int = 0, unclosed: float = 0.0,
+                  repeat: int = 3) -> bool:
+    """
+    Time each extractor over pages of the given sizes and check scaling.
+
+    Scaling is "near-linear" if the time per MB at every size is at most
+    `tolerance` times the lowest time per MB seen on any smaller page (small
+    pages carry fixed overhead, so comparing against the cheapest one catches
+    superlinear growth without being fooled by it).
+
+    Returns:
+        True if every page met the time cap and the scaling check
+    """
+    ok = True
+    for kind in kinds:
+        baseline = None
+        for size in sorted(sizes):
+            content = generate_to_size(kind, size, nesting=nesting, unclosed=unclosed)
+            body = content.encode("utf-8")
+            mb = len(body) / 1_000_000
+            elapsed = time_extract(kind, body, repeat=repeat if mb < 10 else 1)
+            per_mb = elapsed / mb
+            baseline = min(baseline or per_mb, per_mb)
+            ratio = per_mb / baseline
+            status = "ok"
+            if elapsed > cap:
+                status, ok = f"FAIL: over {cap}s cap", False
+            elif ratio > tolerance:
+                status, ok = f"FAIL: {ratio:.1f}x per-MB cost of smaller pages", False
+            print(f"{kind:8} {mb:8.2f} MB {elapsed * 1000:10.1f} ms "
+                  f"{per_mb * 1000:8.2f} ms/MB  x{ratio:4.2f}  {status}", flush=True)
+    return ok
+
+
+def _response(body: bytes, content_type: Optional[str]) -> requests.Response:
+    """Build a Response the way requests' HTTP adapter does, without a server."""
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    if content_type:
+        response.headers["Content-Type"] = content_type
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
+
+
+def _measure(step, repeat: int) -> Tuple[float, int]:
+    """Return (best time in seconds, peak traced allocation in bytes) of step()."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        step()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        step()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def run_decode_benchmark(pages: List[Tuple[str, str, bytes]], repeat: int = 3) -> None:
+    """
+    Compare decode cost and peak memory of the text and bytes parse paths.
+
+    For each page and for a Content-Type with and without charset (the
+    latter makes requests guess the encoding from the body), reports:
+    decoding alone via response.text, response.text followed by extraction
+    (the text path), and extraction straight from response.content (the
+    bytes path, which only decodes the extracted cells).
+
+    Args:
+        pages: List of (label, article kind, raw page bytes)
+        repeat: Timed runs per measurement, best is reported
+    """
+    print(f"{'page':16} {'KB':>8}  {'content-type':24} {'text decode':>20} "
+          f"{'text path':>20} {'bytes path':>20}")
+    for label, kind, body in pages:
+        runs = repeat if len(body) < 1_000_000 else 1
+        for content_type in (None, "text/html; charset=utf-8"):
+            def extract(content):
+                scraper = VMwareVersionScraper(parse_cache_path=None, state_path=None)
+                return getattr(scraper, EXTRACTORS[kind])(content)
+
+            columns = [
+                _measure(lambda: _response(body, content_type).text, runs),
+                _measure(lambda: extract(_response(body, content_type).text), runs),
+                _measure(lambda: extract(_response(body, content_type).content), runs),
+            ]
+            cells = "".join(f" {elapsed * 1000:8.1f} ms {peak / 1_000_000:6.2f} MB"
+                            for elapsed, peak in columns)
+            print(f"{label:16} {len(body) / 1000:8.0f}  {content_type or '(none)':24}{cells}", flush=True)
+
+
+def _parse_size(text: str) -> int:
+    units = {"kb": 1_000, "mb": 1_000_000, "k": 1_000, "m": 1_000_000}
+    text = text.strip().lower()
+    for unit, factor in units.items():
+        if text.endswith(unit):
+            return int(float(text[:-len(unit)]) * factor)
+    return int(text)
+
+
+def main():
+    """Generate stress pages and/or run the parser scaling benchmark."""
+    import argparse
+
+    logging.basicConfig(level=logging.ERROR, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description='VMware KB page stress generator and parser benchmark')
+    parser.add_argument('--sizes', default='100KB,1MB,10MB,50MB',
+                        help='Comma-separated page sizes (default: 100KB,1MB,10MB,50MB)')
+    parser.add_argument('--kinds', default='tools,esxi,vcenter',
+                        help='Comma-separated article kinds (default: tools,esxi,vcenter)')
+    parser.add_argument('--cap', type=float, default=10.0,
+                        help='Hard time cap per page in seconds (default: 10)')
+    parser.add_argument('--tolerance', type=float, default=3.0,
+                        help='Allowed growth of per-MB parse cost vs the smallest page (default: 3)')
+    parser.add_argument('--nesting', type=int, default=0,
+                        help='Wrapper element depth around each cell (default: 0)')
+    parser.add_argument('--unclosed', type=float, default=0.0,
+                        help='Probability of dropping each closing tag (default: 0)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Timed runs per page, best is reported (default: 3)')
+    parser.add_argument('--decode', action='store_true',
+                        help='Compare text vs bytes parsing (time and peak memory) on the saved '
+                             'debug pages and generated pages of --sizes')
+    parser.add_argument('--write', metavar='KIND:SIZE:PATH', action='append', default=[],
+                        help='Only write a generated page, e.g. esxi:5MB:big-esxi.html')
+    args = parser.parse_args()
+
+    if args.write:
+        for spec in args.write:
+            kind, size, path = spec.split(':', 2)
+            content = generate_to_size(kind, _parse_size(size), nesting=args.nesting,
+                                       unclosed=args.unclosed)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            print(f"Wrote {len(content):,} bytes to {path}")
+        return
+
+    sizes = [_parse_size(size) for size in args.sizes.split(',')]
+    kinds = [kind.strip() for kind in args.kinds.split(',')]
+    if args.decode:
+        pages = []
+        for kind in kinds:
+            path = os.path.join(os.path.dirname(os.path.abspath(__file__)), f"debug-{kind}-content.html")
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    pages.append((os.path.basename(path)[6:-13] + " (saved)", kind, f.read()))
+            for size in sorted(sizes):
+                content = generate_to_size(kind, size, nesting=args.nesting, unclosed=args.unclosed)
+                pages.append((f"{kind} {size / 1_000_000:g}MB", kind, content.encode("utf-8")))
+        run_decode_benchmark(pages, repeat=args.repeat)
+        return
+
+    ok = run_benchmark(sizes, kinds, cap=args.cap, tolerance=args.tolerance,
+                       nesting=args.nesting, unclosed=args.unclosed, repeat=args.repeat)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
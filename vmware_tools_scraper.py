@@ -6,223 +6,703 @@ and updates a JSON file with version information.
 """
 
 import requests
+import hashlib
+import html
 import json
+import os
 import re
+import socket
+import time
 from datetime import datetime
 from pathlib import Path
 import sys
-from typing import Dict, Optional, List
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, Optional, List, Tuple, Union
+from urllib.parse import urlsplit
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+from vmware_crawler import LinkCrawler
+from vmware_dashboard import prune_assets, render_compact_json, render_shell
+from vmware_notify import ChangeNotifier, compute_change_events
+from vmware_release import Release
+from vmware_outputs import (iter_products, read_text, render_atom, render_csv, render_markdown,
+                            write_atomic, write_outputs)
+from vmware_resilience import CircuitBreakerRegistry, CircuitOpenError, Deadline
+from vmware_shards import (FileLock, LockTimeoutError, load_partials, parse_shard,
+                           section_time, shard_path, shard_sources, write_partial)
+from vmware_sections import (DEFAULT_MIN_VERSION, discover_sections, display_name,
+                             map_columns, parse_min_version)
+
 logger = logging.getLogger(__name__)
 
+# Per-request timeout cap; the run-wide deadline may grant less.
+DEFAULT_TIMEOUT = 30.0
+
+# Responses worth retrying within a source's share of the deadline.
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Bodies are streamed in chunks of this size so the deadline is checked while
+# a slow response is still downloading.
+DOWNLOAD_CHUNK_SIZE = 16384
+
+# Pages are parsed as raw bytes; only the extracted heading and cell texts are
+# decoded. The KB articles are UTF-8, and all markup searched for is ASCII.
+PAGE_ENCODING = "utf-8"
+
+H3_OPEN_RE = re.compile(rb'<h3[^>]*>', re.IGNORECASE)
+H3_CLOSE_RE = re.compile(rb'</h3\s*>', re.IGNORECASE)
+BLOCK_START_RE = re.compile(rb'<(?:table|p|div|ul|ol|h[1-6])\b', re.IGNORECASE)
+TAG_RE = re.compile(rb'<[^>]+>')
+# (opening tag, closing tag) of the table elements. An element ends at its
+# closing tag or, if that is missing, where the next element of the same kind
+# opens, so pages with unclosed tags are still parsed in linear time.
+TABLE_TAGS = (re.compile(rb'<table[^>]*>', re.IGNORECASE), re.compile(rb'</table\s*>', re.IGNORECASE))
+TBODY_TAGS = (re.compile(rb'<tbody[^>]*>', re.IGNORECASE), re.compile(rb'</tbody\s*>', re.IGNORECASE))
+TR_TAGS = (re.compile(rb'<tr[^>]*>', re.IGNORECASE), re.compile(rb'</tr\s*>', re.IGNORECASE))
+TD_TAGS = (re.compile(rb'<td[^>]*>', re.IGNORECASE), re.compile(rb'</td\s*>', re.IGNORECASE))
+THEAD_TAGS = (re.compile(rb'<thead[^>]*>', re.IGNORECASE), re.compile(rb'</thead\s*>', re.IGNORECASE))
+TH_ROW_RE = re.compile(rb'\s*<th\b', re.IGNORECASE)
+CELL_RE = re.compile(rb'<t[hd][^>]*>(.*?)</t[hd]>', re.DOTALL | re.IGNORECASE)
+LINK_TEXT_RE = re.compile(rb'<a[^>]*>(.*?)</a>', re.DOTALL | re.IGNORECASE)
+HREF_RE = re.compile(rb'<a\s[^>]*href="([^"]+)"', re.IGNORECASE)
+
+# Output formats run() can render; json and html are written by default.
+# "dashboard" is the client-rendered shell plus its compact JSON.
+OUTPUT_FORMATS = ("json", "html", "csv", "markdown", "atom", "dashboard")
+# The JSON file is the published result that each run compares with (for
+# change events, stale fallback and overlapping runs), so it is always written.
+REQUIRED_FORMATS = ("json",)
+
+# (Release attribute, label) of the fields shown on ESXi/vCenter dashboard cards
+CARD_FIELDS = [("version", "Version"), ("release_name", "Release Name"),
+               ("release_date", "Release Date"), ("build_number", "Build Number"),
+               ("available_as", "Available As")]
+
+# Broadcom KB articles for each product
+TOOLS_URL = "https://knowledge.broadcom.com/external/article/304809/build-numbers-and-versions-of-vmware-too.html"
+ESXI_URL = "https://knowledge.broadcom.com/external/article?legacyId=2143832"
+VCENTER_URL = "https://knowledge.broadcom.com/external/article?articleNumber=326316"
+
+# Download page for the latest VMware Tools, linked from the dashboard and
+# crawled (with --crawl) for its package list.
+TOOLS_DOWNLOAD_URL = "https://packages-prod.broadcom.com/tools/releases/latest/windows/"
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+@lru_cache(maxsize=None)
+def parser_fingerprint() -> str:
+    """
+    Hash of the code that extracts releases from a page (this module, section
+    discovery and the Release record). Parse cache entries and HTTP validators
+    recorded by a different version of that code are not reused.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    for module in (__name__, discover_sections.__module__, Release.__module__):
+        try:
+            with open(sys.modules[module].__file__, 'rb') as f:
+                digest.update(f.read())
+        except (AttributeError, OSError):
+            digest.update(module.encode())
+    return digest.hexdigest()
+
+
 class VMwareVersionScraper:
     def __init__(self, output_path: str = "vmware-versions.json", 
-                 web_page_path: str = "vmware-versions.html"):
+                 web_page_path: str = "vmware-versions.html",
+                 notifier: Optional[ChangeNotifier] = None,
+                 crawler: Optional[LinkCrawler] = None,
+                 state_path: Optional[str] = "vmware-scraper-state.json",
+                 deadline: float = 60.0,
+                 max_retries: int = 2,
+                 breaker_threshold: int = 3,
+                 breaker_cooldown: float = 900.0,
+                 parse_cache_path: Optional[str] = "vmware-parse-cache.json",
+                 base_url: Optional[str] = None,
+                 workers: int = 1,
+                 formats: Optional[List[str]] = None,
+                 csv_path: str = "vmware-versions.csv",
+                 markdown_path: str = "vmware-versions.md",
+                 atom_path: str = "vmware-versions.atom",
+                 dashboard_path: str = "vmware-dashboard.html",
+                 compact_json_path: str = "vmware-versions.min.json",
+                 min_version: str = DEFAULT_MIN_VERSION,
+                 shard: Optional[str] = None,
+                 partials_dir: str = "vmware-partials",
+                 worker_id: Optional[str] = None,
+                 lock_timeout: float = 120.0):
         self.output_path = output_path
         self.web_page_path = web_page_path
+        self.notifier = notifier
+        self.crawler = crawler
+        self.state_path = state_path
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.workers = workers
+        self.formats = list(formats or ["json", "html"])
+        missing = [f for f in REQUIRED_FORMATS if f not in self.formats]
+        if missing:
+            raise ValueError(f"Output formats must include {', '.join(missing)}: "
+                             f"{output_path} is what the next run compares with")
+        self.csv_path = csv_path
+        self.markdown_path = markdown_path
+        self.atom_path = atom_path
+        self.dashboard_path = dashboard_path
+        self.compact_json_path = compact_json_path
+        # Oldest major.minor ESXi/vCenter section to track.
+        self.min_version = parse_min_version(min_version)
+        # Shard workers ("K/N") scrape every Nth source and write partials to
+        # partials_dir instead of publishing; merge() publishes them.
+        self.shard = parse_shard(shard) if shard else None
+        self.partials_dir = partials_dir
+        self.worker_id = worker_id
+        # Publishing holds this lock so overlapping runs cannot interleave.
+        self.lock_path = f"{output_path}.lock"
+        self.lock_timeout = lock_timeout
+
+        # Persistent state: circuit breakers per host and the last successfully
+        # parsed result per source.
+        state = self.load_state()
+        self.breakers = CircuitBreakerRegistry(breaker_threshold, breaker_cooldown,
+                                               state.get("circuits"))
+        self.last_good: Dict[str, Dict] = state.get("last_good", {})
+        # URL -> {"etag": ..., "last_modified": ..., "config": ...} for
+        # conditional requests. Validators are only sent if they were saved
+        # under the current extract_config, so a parser or --min-version
+        # change makes the next run parse every page again.
+        self.validators: Dict[str, Dict] = state.get("validators", {})
+        self.extract_config = (f"{parser_fingerprint()}:{self.min_version[0]}.{self.min_version[1]}"
+                               f"{':links' if crawler else ''}")
+
+        # Section content hash -> extracted first-row cells, reused across runs
+        # so that only sections whose HTML changed are re-parsed. The file
+        # keeps the entries per source, so sources that are not parsed in a
+        # run (not modified, or failed) keep theirs.
+        self.parse_cache_path = parse_cache_path
+        self._parse_cache_sources: Dict[str, Dict[str, List[str]]] = self.load_parse_cache()
+        self.parse_cache: Dict[str, List[str]] = {
+            key: cells for entries in self._parse_cache_sources.values() for key, cells in entries.items()}
+        # Source -> cache keys its page used in this run
+        self._parse_cache_used: Dict[str, set] = {}
+        self._local = threading.local()
         
-        # URLs for different VMware products
-        self.tools_url = "https://knowledge.broadcom.com/external/article/304809/build-numbers-and-versions-of-vmware-too.html"
-        self.esxi_url = "https://knowledge.broadcom.com/external/article?legacyId=2143832"
-        self.vcenter_url = "https://knowledge.broadcom.com/external/article?articleNumber=326316"
-        
+        # URLs for different VMware products. base_url (e.g. a local mock KB
+        # server) replaces the scheme and host while keeping the article paths.
+        self.tools_url = self._with_base_url(TOOLS_URL, base_url)
+        self.esxi_url = self._with_base_url(ESXI_URL, base_url)
+        self.vcenter_url = self._with_base_url(VCENTER_URL, base_url)
 
+    @staticmethod
+    def _with_base_url(url: str, base_url: Optional[str]) -> str:
+        if not base_url:
+            return url
+        parts = urlsplit(url)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        return base_url.rstrip('/') + path
     
     def get_timestamp(self) -> str:
         """Get current timestamp in ISO format."""
         return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    def load_state(self) -> Dict:
+        """
+        Load circuit breaker and last-known-good state from the previous run.
+
+        Returns:
+            State dict (empty if there is no usable state file)
+        """
+        if not self.state_path:
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable state file {self.state_path}: {e}")
+            return {}
+
+    def save_state(self) -> None:
+        """Persist circuit breaker and last-known-good state for the next run."""
+        if not self.state_path:
+            return
+        urls = (self.tools_url, self.esxi_url, self.vcenter_url)
+        state = {"circuits": self.breakers.to_dict(), "last_good": self.last_good,
+                 "validators": {url: validator for url, validator in self.validators.items()
+                                if url in urls}}
+        tmp_path = f"{self.state_path}.tmp.{os.getpid()}"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            logger.error(f"Error saving state file: {e}")
+
+    def load_parse_cache(self) -> Dict[str, Dict[str, List[str]]]:
+        """
+        Load the section parse cache written by the previous run.
+
+        Returns:
+            Dict mapping source names to {section content hash: extracted cells}
+            (empty if the cache was written by a different parser version)
+        """
+        if not self.parse_cache_path:
+            return {}
+        try:
+            with open(self.parse_cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable parse cache {self.parse_cache_path}: {e}")
+            return {}
+        if not isinstance(cache, dict) or cache.get("parser") != parser_fingerprint():
+            logger.info("Parse cache was written by a different parser version, re-parsing all sections")
+            return {}
+        return cache.get("sources", {})
+
+    def save_parse_cache(self) -> None:
+        """
+        Persist the parse cache. Sources parsed in this run keep only the
+        entries their page used; other sources keep their previous entries.
+        """
+        if not self.parse_cache_path:
+            return
+        sources = dict(self._parse_cache_sources)
+        for source, keys in self._parse_cache_used.items():
+            sources[source] = {key: self.parse_cache[key] for key in keys if key in self.parse_cache}
+        tmp_path = f"{self.parse_cache_path}.tmp.{os.getpid()}"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"parser": parser_fingerprint(), "sources": sources}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.parse_cache_path)
+        except OSError as e:
+            logger.error(f"Error saving parse cache: {e}")
+
+    def _fetch(self, url: str, timeout: float, conditional: bool = False) -> requests.Response:
+        """
+        GET url within timeout seconds, retrying transient failures while time
+        remains. Fails fast if the host's circuit breaker is open.
+
+        Args:
+            url: URL to fetch
+            timeout: Total seconds available, including retries and backoff
+            conditional: Send the ETag/Last-Modified validators saved for url
+                (under the current extract_config), for callers that can
+                reuse their previous result on a 304
+
+        Returns:
+            The successful response (status 304 if conditional and unchanged)
+
+        Raises:
+            requests.RequestException (including CircuitOpenError) on failure
+        """
+        breaker = self.breakers.get(urlsplit(url).netloc)
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {breaker.host} after "
+                                   f"{breaker.failures} consecutive failures")
+
+        headers = dict(HEADERS)
+        validator = self.validators.get(url, {})
+        if validator.get("config") != self.extract_config:
+            validator = {}
+        if conditional and validator.get("etag"):
+            headers['If-None-Match'] = validator["etag"]
+        if conditional and validator.get("last_modified"):
+            headers['If-Modified-Since'] = validator["last_modified"]
+
+        expires_at = time.monotonic() + timeout
+        attempt = 0
+        while True:
+            remaining = expires_at - time.monotonic()
+            try:
+                if remaining <= 0:
+                    raise requests.Timeout(f"Deadline exhausted before fetching {url}")
+                # requests' timeout only bounds the connect and each socket read,
+                # so the body is streamed and the deadline enforced while reading.
+                response = requests.get(url, headers=headers, timeout=remaining, stream=True)
+                try:
+                    response.raise_for_status()
+                    self._download(response, url, expires_at)
+                finally:
+                    response.close()
+                breaker.record_success()
+                return response
+            except requests.RequestException as e:
+                status = e.response.status_code if e.response is not None else None
+                retryable = status is None or status in RETRY_STATUS_CODES
+                backoff = 2 ** attempt
+                attempt += 1
+                if (not retryable or attempt > self.max_retries
+                        or expires_at - time.monotonic() <= backoff):
+                    breaker.record_failure()
+                    raise
+                logger.warning(f"Retrying {url} in {backoff}s after error: {e}")
+                time.sleep(backoff)
+
+    @staticmethod
+    def _download(response: requests.Response, url: str, expires_at: float) -> None:
+        """
+        Read a streamed response body into response.content, giving up at
+        expires_at (time.monotonic()). A read that stalls past the deadline is
+        cut off by shutting the connection down.
+
+        Raises:
+            requests.Timeout: If the body was not complete by expires_at
+        """
+        def abort():
+            sock = getattr(getattr(response.raw, "connection", None), "sock", None)
+            if sock is not None:
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+        timer = threading.Timer(max(0.0, expires_at - time.monotonic()), abort)
+        timer.daemon = True
+        timer.start()
+        chunks = []
+        try:
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                chunks.append(chunk)
+                if time.monotonic() >= expires_at:
+                    break
+        except (requests.RequestException, OSError) as e:
+            if time.monotonic() < expires_at:
+                raise
+            raise requests.Timeout(f"Deadline exhausted while downloading {url}") from e
+        finally:
+            timer.cancel()
+        if time.monotonic() >= expires_at:
+            raise requests.Timeout(f"Deadline exhausted while downloading {url}")
+        response._content = b"".join(chunks)
+
+    def _last_known_good(self, source: str, previous_section: Optional[Dict]) -> Optional[Dict]:
+        """
+        Get the newest good result for a source, marked as stale.
+
+        Candidates are the result this process last parsed (from its state
+        file) and the section currently published, which may have been
+        written by another run. The published section wins ties, so a stale
+        fallback never replaces published data with older data.
+
+        Args:
+            source: Source name ("tools", "esxi" or "vcenter")
+            previous_section: The source's section of the published JSON file
+
+        Returns:
+            Stale copy of the newest good result, or None if there is none
+        """
+        candidates = []
+        if previous_section:
+            result = {key: value for key, value in previous_section.items()
+                      if key not in ("Stale", "StaleAgeSeconds")}
+            candidates.append((section_time(previous_section) or time.time(), 1, result))
+        entry = self.last_good.get(source)
+        if entry:
+            candidates.append((section_time(entry["result"]) or entry["saved_at"], 0, entry["result"]))
+        if not candidates:
+            return None
+        saved_at, _, result = max(candidates, key=lambda candidate: candidate[:2])
+
+        stale = dict(result)
+        stale["Stale"] = True
+        stale["StaleAgeSeconds"] = max(0, int(time.time() - saved_at))
+        logger.warning(f"Serving last known good {source} data "
+                       f"({stale['StaleAgeSeconds']}s old)")
+        return stale
     
-    def scrape_tools_version_info(self) -> Optional[Dict]:
+    def _scrape_source(self, source: str, url: str, label: str, debug_path: str,
+                       extract, timeout: float) -> Optional[Dict]:
         """
-        Scrape the latest VMware Tools version from the Broadcom knowledge base.
-        
+        Fetch one KB article and extract its version information.
+
+        If the page is unchanged since the last successful run (HTTP 304), the
+        previously parsed result is reused without downloading or parsing.
+
+        Args:
+            source: Source name ("tools", "esxi" or "vcenter")
+            url: Article URL
+            label: Product name for log messages
+            debug_path: File to save the raw page content to
+            extract: One of the _extract_* methods
+            timeout: Seconds this source may spend, including retries
+
         Returns:
             Dict containing version information or None if failed
         """
         try:
-            logger.info(f"Fetching VMware Tools version information from: {self.tools_url}")
-            
-            # Make HTTP request
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(self.tools_url, headers=headers, timeout=30)
-            response.raise_for_status()
-            
-            logger.info("Successfully retrieved VMware Tools webpage content")
-            
-            # Save debug content
-            with open("debug-tools-content.html", "w", encoding="utf-8") as f:
-                f.write(response.text)
-            logger.info("Saved VMware Tools debug content to debug-tools-content.html")
-            
-            # Parse the HTML content
-            content = response.text
-            
-            # Extract version information using multiple patterns
-            version_info = self._extract_tools_version_data(content)
-            
+            logger.info(f"Fetching {label} version information from: {url}")
+
+            cached = self.last_good.get(source)
+            response = self._fetch(url, timeout, conditional=cached is not None)
+
+            if response.status_code == 304:
+                logger.info(f"{label} webpage not modified, reusing previously parsed result")
+                version_info = dict(cached["result"])
+            else:
+                logger.info(f"Successfully retrieved {label} webpage content")
+
+                # Save debug content as received; the page is never decoded as a whole
+                with open(debug_path, "wb") as f:
+                    f.write(response.content)
+                logger.info(f"Saved {label} debug content to {debug_path}")
+
+                # Extract version information from the raw HTML bytes
+                version_info = self._parse_page(source, extract, response.content)
+                if version_info:
+                    self.validators[url] = {
+                        "etag": response.headers.get('ETag'),
+                        "last_modified": response.headers.get('Last-Modified'),
+                        "config": self.extract_config
+                    }
+                else:
+                    # Without validators the page is fetched and parsed in full
+                    # next time, instead of a 304 reusing the older result.
+                    self.validators.pop(url, None)
+
             if version_info:
                 version_info.update({
                     "LastUpdated": self.get_timestamp(),
-                    "SourceUrl": self.tools_url
+                    "SourceUrl": url
                 })
                 return version_info
             else:
-                logger.warning("Could not parse VMware Tools version information from the webpage")
+                logger.warning(f"Could not parse {label} version information from the webpage")
                 return None
-                
+
         except requests.RequestException as e:
-            logger.error(f"Error fetching VMware Tools version: {e}")
+            logger.error(f"Error fetching {label} version: {e}")
             return None
         except Exception as e:
             logger.error(f"Unexpected error: {e}")
             return None
+
+    def _parse_page(self, source: str, extract, content: bytes) -> Optional[Dict]:
+        """
+        Run an _extract_* method on a page, recording which parse cache
+        entries it used so save_parse_cache() keeps exactly those for source.
+        """
+        used = set()
+        self._local.parse_cache_used = used
+        try:
+            version_info = extract(content)
+        finally:
+            self._local.parse_cache_used = None
+        if version_info:
+            self._parse_cache_used[source] = used
+        return version_info
+
+    def scrape_tools_version_info(self, timeout: float = DEFAULT_TIMEOUT) -> Optional[Dict]:
+        """
+        Scrape the latest VMware Tools version from the Broadcom knowledge base.
+        
+        Args:
+            timeout: Seconds this source may spend, including retries
+
+        Returns:
+            Dict containing version information or None if failed
+        """
+        return self._scrape_source("tools", self.tools_url, "VMware Tools",
+                                   "debug-tools-content.html",
+                                   self._extract_tools_version_data, timeout)
     
-    def scrape_esxi_version_info(self) -> Optional[Dict]:
+    def scrape_esxi_version_info(self, timeout: float = DEFAULT_TIMEOUT) -> Optional[Dict]:
         """
         Scrape the latest ESXi versions from the Broadcom knowledge base.
         
+        Args:
+            timeout: Seconds this source may spend, including retries
+
         Returns:
             Dict containing ESXi version information or None if failed
         """
-        try:
-            logger.info(f"Fetching ESXi version information from: {self.esxi_url}")
-            
-            # Make HTTP request
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(self.esxi_url, headers=headers, timeout=30)
-            response.raise_for_status()
-            
-            logger.info("Successfully retrieved ESXi webpage content")
-            
-            # Save debug content
-            with open("debug-esxi-content.html", "w", encoding="utf-8") as f:
-                f.write(response.text)
-            logger.info("Saved ESXi debug content to debug-esxi-content.html")
-            
-            # Parse the HTML content
-            content = response.text
-            
-            # Extract version information using multiple patterns
-            version_info = self._extract_esxi_version_data(content)
-            
-            if version_info:
-                version_info.update({
-                    "LastUpdated": self.get_timestamp(),
-                    "SourceUrl": self.esxi_url
-                })
-                return version_info
-            else:
-                logger.warning("Could not parse ESXi version information from the webpage")
-                return None
-                
-        except requests.RequestException as e:
-            logger.error(f"Error fetching ESXi version: {e}")
-            return None
-        except Exception as e:
-            logger.error(f"Unexpected error: {e}")
-            return None
+        return self._scrape_source("esxi", self.esxi_url, "ESXi",
+                                   "debug-esxi-content.html",
+                                   self._extract_esxi_version_data, timeout)
     
-    def scrape_vcenter_version_info(self) -> Optional[Dict]:
+    def scrape_vcenter_version_info(self, timeout: float = DEFAULT_TIMEOUT) -> Optional[Dict]:
         """
         Scrape the latest vCenter versions from the Broadcom knowledge base.
         
+        Args:
+            timeout: Seconds this source may spend, including retries
+
         Returns:
             Dict containing vCenter version information or None if failed
         """
-        try:
-            logger.info(f"Fetching vCenter version information from: {self.vcenter_url}")
-            
-            # Make HTTP request
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(self.vcenter_url, headers=headers, timeout=30)
-            response.raise_for_status()
-            
-            logger.info("Successfully retrieved vCenter webpage content")
-            
-            # Save debug content
-            with open("debug-vcenter-content.html", "w", encoding="utf-8") as f:
-                f.write(response.text)
-            logger.info("Saved vCenter debug content to debug-vcenter-content.html")
-            
-            # Parse the HTML content
-            content = response.text
-            
-            # Extract version information using multiple patterns
-            version_info = self._extract_vcenter_version_data(content)
-            
-            if version_info:
-                version_info.update({
-                    "LastUpdated": self.get_timestamp(),
-                    "SourceUrl": self.vcenter_url
-                })
-                return version_info
-            else:
-                logger.warning("Could not parse vCenter version information from the webpage")
-                return None
-                
-        except requests.RequestException as e:
-            logger.error(f"Error fetching vCenter version: {e}")
-            return None
-        except Exception as e:
-            logger.error(f"Unexpected error: {e}")
-            return None
+        return self._scrape_source("vcenter", self.vcenter_url, "vCenter",
+                                   "debug-vcenter-content.html",
+                                   self._extract_vcenter_version_data, timeout)
     
-    def _split_sections(self, content: str) -> Dict[str, str]:
+    @staticmethod
+    def _as_bytes(content: Union[bytes, str]) -> bytes:
+        return content.encode(PAGE_ENCODING) if isinstance(content, str) else content
+
+    @staticmethod
+    def _text(fragment: bytes) -> str:
+        """Decode an extracted HTML fragment with its tags stripped."""
+        return TAG_RE.sub(b'', fragment).decode(PAGE_ENCODING, errors='replace').strip()
+
+    @staticmethod
+    def _elements(content: bytes, tags) -> Iterator[Tuple[int, int, int, int]]:
+        """
+        Find the elements of one kind in content, in order.
+
+        Each closing tag is only searched for up to the next opening tag, and
+        an unclosed element ends there, so the scan is linear in len(content).
+
+        Args:
+            content: HTML to search
+            tags: (opening tag regex, closing tag regex), e.g. TR_TAGS
+
+        Yields:
+            (start, inner start, inner end, end) offsets of each element
+        """
+        open_re, close_re = tags
+        opening = open_re.search(content)
+        while opening:
+            following = open_re.search(content, opening.end())
+            limit = following.start() if following else len(content)
+            closing = close_re.search(content, opening.end(), limit)
+            if closing:
+                yield opening.start(), opening.end(), closing.start(), closing.end()
+            else:
+                yield opening.start(), opening.end(), limit, limit
+            opening = following
+
+    def _first_element(self, content: bytes, tags, inner: bool = True) -> Optional[bytes]:
+        """First element of a kind in content (its inner HTML, or all of it), or None."""
+        for start, inner_start, inner_end, end in self._elements(content, tags):
+            return content[inner_start:inner_end] if inner else content[start:end]
+        return None
+
+    def _split_sections(self, content: Union[bytes, str]) -> Dict[str, bytes]:
         """
         Split the Broadcom KB article into sections keyed by their <h3> heading text.
         The article uses <h3 id="..."><u>Heading Text</u>...</h3> for each version
         section, followed by the table for that version.
 
         Returns:
-            Dict mapping heading text (e.g. "vCenter 9.0") to the HTML between that
-            heading and the next one.
+            Dict mapping heading text (e.g. "vCenter 9.0") to the raw HTML between
+            that heading and the next one.
         """
-        headings = list(re.finditer(r'<h3[^>]*>(.*?)</h3>', content, re.DOTALL | re.IGNORECASE))
-        sections: Dict[str, str] = {}
-        for i, heading in enumerate(headings):
+        content = self._as_bytes(content)
+        # Each heading's closing tag is searched for only up to the next heading,
+        # so a page with unclosed <h3> tags is still split in linear time.
+        headings = [match.start() for match in H3_OPEN_RE.finditer(content)]
+        sections: Dict[str, bytes] = {}
+        for i, heading_start in enumerate(headings):
+            limit = headings[i + 1] if i + 1 < len(headings) else len(content)
+            title_start = content.index(b'>', heading_start) + 1
+            close = H3_CLOSE_RE.search(content, title_start, limit)
+            if close:
+                title_end, start = close.start(), close.end()
+            else:
+                # Unclosed heading: the title ends where the section's content starts.
+                block = BLOCK_START_RE.search(content, title_start, limit)
+                title_end = start = block.start() if block else limit
             # Headings may include a trailing "back to top" link (e.g. "🔝") after the title text.
-            title = re.sub(r'<[^>]+>', '', heading.group(1)).replace('\U0001f51d', '').strip()
-            start = heading.end()
-            end = headings[i + 1].start() if i + 1 < len(headings) else len(content)
-            sections[title] = content[start:end]
+            title = self._text(content[title_start:title_end]).replace('\U0001f51d', '').strip()
+            sections[title] = content[start:limit]
         return sections
 
-    def _first_data_row_cells(self, section_html: str) -> Optional[List[str]]:
+    def _first_data_row_cells(self, section_html: bytes) -> Optional[List[str]]:
         """
         Extract the text of each <td> in the first <tr> of the first <tbody> found
         in section_html. If a cell's text is wrapped in an <a> link, the link text
         is used (this is how build numbers/release notes links are formatted).
 
+        Results are memoized by a hash of section_html, so unchanged sections
+        are not re-parsed on later runs.
+
         Returns:
             List of cell text values, or None if no row could be found.
         """
-        tbody_match = re.search(r'<tbody[^>]*>(.*?)</tbody>', section_html, re.DOTALL | re.IGNORECASE)
-        body = tbody_match.group(1) if tbody_match else section_html
+        return self._memoized("", section_html, self._parse_first_data_row_cells)
+
+    def _header_cells(self, section_html: bytes) -> Optional[List[str]]:
+        """
+        Extract the text of each header cell of the first table in section_html:
+        the first row of its <thead>, or else the first row made of <th> cells.
+        Memoized like _first_data_row_cells().
+
+        Returns:
+            List of header texts, or None if the table has no header row.
+        """
+        return self._memoized("th:", section_html, self._parse_header_cells)
+
+    def _memoized(self, prefix: str, section_html: bytes, parse) -> Optional[List[str]]:
+        key = prefix + hashlib.blake2b(section_html, digest_size=16).hexdigest()
+        used = getattr(self._local, "parse_cache_used", None)
+        if used is not None:
+            used.add(key)
+        if key in self.parse_cache:
+            return self.parse_cache[key]
+        cells = parse(section_html)
+        self.parse_cache[key] = cells
+        return cells
+
+    def _first_data_row_links(self, section_html: bytes) -> Optional[List[str]]:
+        """
+        Extract the absolute http(s) link targets in the first data row of
+        section_html (release notes, downloads), deduplicated, in cell order.
+        Memoized like _first_data_row_cells().
+
+        Returns:
+            List of URLs, or None if the row has no links.
+        """
+        return self._memoized("a:", section_html, self._parse_first_data_row_links)
+
+    def _first_data_row(self, section_html: bytes) -> Optional[bytes]:
+        body = self._first_element(section_html, TBODY_TAGS)
+        return self._first_element(section_html if body is None else body, TR_TAGS)
+
+    def _parse_first_data_row_links(self, section_html: bytes) -> Optional[List[str]]:
+        """Uncached implementation of _first_data_row_links()."""
+        row = self._first_data_row(section_html)
+        if not row:
+            return None
+        links = []
+        for href in HREF_RE.findall(row):
+            href = html.unescape(href.decode(PAGE_ENCODING, errors='replace')).strip()
+            if re.match(r'https?://', href, re.IGNORECASE) and href not in links:
+                links.append(href)
+        return links if links else None
 
-        row_match = re.search(r'<tr[^>]*>(.*?)</tr>', body, re.DOTALL | re.IGNORECASE)
-        if not row_match:
+    def _parse_first_data_row_cells(self, section_html: bytes) -> Optional[List[str]]:
+        """Uncached implementation of _first_data_row_cells()."""
+        row = self._first_data_row(section_html)
+        if not row:
             return None
 
         cells = []
-        for td_match in re.finditer(r'<td[^>]*>(.*?)</td>', row_match.group(1), re.DOTALL | re.IGNORECASE):
-            cell_html = td_match.group(1)
-            link_match = re.search(r'<a[^>]*>(.*?)</a>', cell_html, re.DOTALL | re.IGNORECASE)
-            text = link_match.group(1) if link_match else cell_html
-            text = re.sub(r'<[^>]+>', '', text).strip()
-            cells.append(text)
+        for _, inner_start, inner_end, _ in self._elements(row, TD_TAGS):
+            cell_html = row[inner_start:inner_end]
+            link_match = LINK_TEXT_RE.search(cell_html)
+            cells.append(self._text(link_match.group(1) if link_match else cell_html))
 
         return cells if cells else None
 
-    def _extract_tools_version_data(self, content: str) -> Optional[Dict]:
+    def _parse_header_cells(self, section_html: bytes) -> Optional[List[str]]:
+        """Uncached implementation of _header_cells()."""
+        head = self._first_element(section_html, THEAD_TAGS)
+        if head is not None:
+            row = self._first_element(head, TR_TAGS)
+        else:
+            row = next((section_html[inner_start:inner_end]
+                        for _, inner_start, inner_end, _ in self._elements(section_html, TR_TAGS)
+                        if TH_ROW_RE.match(section_html, inner_start)), None)
+        if row is None:
+            return None
+
+        cells = [re.sub(r'\s+', ' ', self._text(cell))
+                 for cell in CELL_RE.findall(row)]
+        return cells if cells else None
+
+    def _extract_tools_version_data(self, content: Union[bytes, str]) -> Optional[Dict]:
         """
         Extract VMware Tools version data from HTML content.
 
@@ -230,178 +710,155 @@ class VMwareVersionScraper:
         data row being: Version | Release Date | Build Number | Internal Tools Version.
 
         Args:
-            content: HTML content to parse
+            content: HTML content to parse, as raw UTF-8 bytes (or str)
 
         Returns:
             Dict with version information or None if parsing fails
         """
         try:
-            table_match = re.search(r'<table[^>]*>.*?</table>', content, re.DOTALL | re.IGNORECASE)
-            if not table_match:
+            table = self._first_element(self._as_bytes(content), TABLE_TAGS, inner=False)
+            if not table:
                 logger.warning("Could not find VMware Tools version table")
                 return None
 
-            cells = self._first_data_row_cells(table_match.group(0))
+            cells = self._first_data_row_cells(table)
             if not cells or len(cells) < 4:
                 logger.warning("Could not parse VMware Tools version information from the webpage")
                 return None
 
             version = re.sub(r'(?i)^VMware Tools\s*', '', cells[0]).strip()
-            release_date = cells[1].strip()
-            build_number = cells[2].strip()
-            tool_internal_version = cells[3].strip()
-
-            logger.info(f"Found VMware Tools version: {version}")
-            logger.info(f"Found VMware Tools release date: {release_date}")
-            logger.info(f"Found VMware Tools build number: {build_number}")
-            logger.info(f"Found VMware Tools internal version: {tool_internal_version}")
-
-            if version:
-                return {
-                    "Version": version,
-                    "ReleaseDate": release_date,
-                    "BuildNumber": build_number,
-                    "ToolInternalVersion": tool_internal_version
-                }
+            if not version:
+                return None
 
-            return None
+            release = Release("VMwareTools",
+                              version=version,
+                              release_date=cells[1].strip(),
+                              build_number=cells[2].strip(),
+                              tool_internal_version=cells[3].strip())
+            record = release.to_dict()
+            links = self._first_data_row_links(table) if self.crawler else None
+            if links:
+                record["Links"] = links
+            return record
 
         except Exception as e:
             logger.error(f"Error parsing VMware Tools version data: {e}")
             return None
     
-    def _extract_esxi_version_data(self, content: str) -> Optional[Dict]:
+    def _extract_esxi_version_data(self, content: Union[bytes, str]) -> Optional[Dict]:
         """
         Extract ESXi version data from HTML content.
 
-        Each version section is a <h3> heading followed by a table whose first
-        data row is: Version | Release Name | Release Date | Build Number | Available as.
+        Every "ESX 9.1" / "ESXi 8.0" style section at or above min_version is
+        tracked. Its table's first data row holds the latest release, typically
+        Version | Release Name | Release Date | Build Number | Available as.
 
         Args:
-            content: HTML content to parse
+            content: HTML content to parse, as raw UTF-8 bytes (or str)
 
         Returns:
             Dict with ESXi version information or None if parsing fails
         """
         try:
-            logger.info("Starting ESXi version data extraction")
-            sections = self._split_sections(content)
-            esxi_versions = {}
-
-            # Heading text -> dict key. All of these sections share the same
-            # 5-column table layout.
-            targets = {
-                "ESX 9.1": "ESX_9_1",
-                "ESX 9.0": "ESX_9_0",
-                "ESXi 8.0": "ESXi_8_0",
-                "ESXi 7.0": "ESXi_7_0",
-            }
-
-            for heading, version_key in targets.items():
-                section_content = sections.get(heading)
-                if not section_content:
-                    logger.warning(f"Could not find section for {version_key}")
-                    continue
-
-                cells = self._first_data_row_cells(section_content)
-                if not cells or len(cells) < 5:
-                    logger.warning(f"Could not extract row data for {version_key}")
-                    continue
-
-                version, release_name, release_date, build_number, available_as = cells[:5]
-
-                esxi_versions[version_key] = {
-                    "Version": version,
-                    "ReleaseName": release_name,
-                    "ReleaseDate": release_date,
-                    "BuildNumber": build_number,
-                    "AvailableAs": available_as
-                }
-
-                logger.info(f"Found {version_key} version: {version}")
-                logger.info(f"Found {version_key} release name: {release_name}")
-                logger.info(f"Found {version_key} release date: {release_date}")
-                logger.info(f"Found {version_key} build number: {build_number}")
-                logger.info(f"Found {version_key} availability: {available_as}")
-
+            esxi_versions = self._extract_release_sections("esxi", content)
             return esxi_versions if esxi_versions else None
 
         except Exception as e:
             logger.error(f"Error parsing ESXi version data: {e}")
             return None
     
-    def _extract_vcenter_version_data(self, content: str) -> Optional[Dict]:
+    def _extract_vcenter_version_data(self, content: Union[bytes, str]) -> Optional[Dict]:
         """
         Extract vCenter version data from HTML content.
 
-        vCenter 9.x sections have a 3-column table (Version | Release Date | Build).
-        vCenter Server 8.0/7.0 sections have a 5-column table
-        (Release name | Version | Release Date | Build/Release Notes | MOB/vpxd.log).
+        Every "vCenter 9.1" / "vCenter Server 8.0" style section at or above
+        min_version is tracked. vCenter 9.x sections have a 3-column table
+        (Version | Release Date | Build); vCenter Server 8.0/7.0 sections have a
+        5-column table (Release name | Version | Release Date | Build/Release Notes
+        | MOB/vpxd.log). Columns are located from each table's header row.
 
         Args:
-            content: HTML content to parse
+            content: HTML content to parse, as raw UTF-8 bytes (or str)
 
         Returns:
             Dict with vCenter version information or None if parsing fails
         """
         try:
-            sections = self._split_sections(content)
-            vcenter_versions = {}
-
-            # Heading text -> (dict key, whether the table has a Release name column first)
-            targets = [
-                ("vCenter 9.1", "vCenter_9_1", False),
-                ("vCenter 9.0", "vCenter_9_0", False),
-                ("vCenter Server 8.0", "vCenter_8_0", True),
-                ("vCenter Server 7.0", "vCenter_7_0", True),
-            ]
-
-            for heading, version_key, has_release_name in targets:
-                section_content = sections.get(heading)
-                if not section_content:
-                    logger.warning(f"Could not find section for {version_key}")
-                    continue
-
-                cells = self._first_data_row_cells(section_content)
-                if not cells:
-                    logger.warning(f"Could not extract row data for {version_key}")
-                    continue
-
-                if has_release_name:
-                    if len(cells) < 4:
-                        logger.warning(f"Could not extract row data for {version_key}")
-                        continue
-                    release_name, version, release_date, build_number = cells[:4]
-                    vcenter_data = {
-                        "Version": version,
-                        "ReleaseName": release_name,
-                        "ReleaseDate": release_date,
-                        "BuildNumber": build_number
-                    }
-                    logger.info(f"Found {version_key} release name: {release_name}")
-                else:
-                    if len(cells) < 3:
-                        logger.warning(f"Could not extract row data for {version_key}")
-                        continue
-                    version, release_date, build_number = cells[:3]
-                    vcenter_data = {
-                        "Version": version,
-                        "ReleaseDate": release_date,
-                        "BuildNumber": build_number
-                    }
-
-                vcenter_versions[version_key] = vcenter_data
-
-                logger.info(f"Found {version_key} version: {version}")
-                logger.info(f"Found {version_key} release date: {release_date}")
-                logger.info(f"Found {version_key} build number: {build_number}")
-
+            vcenter_versions = self._extract_release_sections("vcenter", content)
             return vcenter_versions if vcenter_versions else None
 
         except Exception as e:
             logger.error(f"Error parsing vCenter version data: {e}")
             return None
     
+    def _extract_release_sections(self, product: str, content: Union[bytes, str]) -> Dict[str, Dict]:
+        """
+        Extract the latest release of every version section of a product.
+
+        Args:
+            product: "esxi" or "vcenter"
+            content: HTML content to parse, as raw UTF-8 bytes (or str)
+
+        Returns:
+            Dict mapping product keys (e.g. "ESXi_8_0") to release dicts, in page order
+        """
+        sections = self._split_sections(content)
+        found = discover_sections(product, sections, self.min_version)
+        if not found:
+            logger.warning(f"Could not find any {product} version sections")
+
+        versions = {}
+        for version_key, heading in found:
+            section_content = sections[heading]
+            cells = self._first_data_row_cells(section_content)
+            columns = map_columns(product, self._header_cells(section_content), len(cells or []))
+            if not cells or not columns:
+                logger.warning(f"Could not extract row data for {version_key}")
+                continue
+
+            fields = {field: cells[index].strip() for field, index in columns.items()}
+            release = Release(version_key, **fields)
+            record = release.to_dict()
+            links = self._first_data_row_links(section_content) if self.crawler else None
+            if links:
+                record["Links"] = links
+            versions[version_key] = record
+        return versions
+
+    def load_previous_result(self) -> Optional[Dict]:
+        """
+        Load the result written by the previous run, if any.
+
+        Returns:
+            Dict with the previous JSON content or None if unavailable
+        """
+        try:
+            with open(self.output_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read previous JSON file {self.output_path}: {e}")
+            return None
+
+    def build_result(self, tools_info: Dict, esxi_info: Dict, vcenter_info: Dict) -> Dict:
+        """
+        Build the in-memory result that every output format is rendered from.
+
+        Returns:
+            Dict in the vmware-versions.json layout
+        """
+        return {
+            "LastUpdated": self.get_timestamp(),
+            "VMwareTools": tools_info,
+            "ESXi": esxi_info,
+            "vCenter": vcenter_info
+        }
+
+    def render_json(self, result: Dict) -> str:
+        """Render the result as the vmware-versions.json document."""
+        return json.dumps(result, indent=2, ensure_ascii=False)
+
     def update_json_file(self, tools_info: Dict, esxi_info: Dict, vcenter_info: Dict) -> bool:
         """
         Update the JSON file with new version information.
@@ -415,17 +872,10 @@ class VMwareVersionScraper:
             True if successful, False otherwise
         """
         try:
-            # Create the new entry
-            new_entry = {
-                "LastUpdated": self.get_timestamp(),
-                "VMwareTools": tools_info,
-                "ESXi": esxi_info,
-                "vCenter": vcenter_info
-            }
+            new_entry = self.build_result(tools_info, esxi_info, vcenter_info)
             
-            # Write new data to file (overwriting existing content)
-            with open(self.output_path, 'w', encoding='utf-8') as f:
-                json.dump(new_entry, f, indent=2, ensure_ascii=False)
+            # Replace the file atomically (overwriting existing content)
+            write_atomic(self.output_path, self.render_json(new_entry))
             
             logger.info(f"Overwrote JSON file: {self.output_path}")
             return True
@@ -447,22 +897,48 @@ class VMwareVersionScraper:
             True if successful, False otherwise
         """
         try:
-            # Get last updated timestamp
-            last_updated = self.get_timestamp()
-
-            # Safe access to dictionaries
-            tools_info_safe = tools_info or {}
-            esx_9_1_info = esxi_info.get('ESX_9_1', {})
-            esx_9_0_info = esxi_info.get('ESX_9_0', {})
-            esxi_8_0_info = esxi_info.get('ESXi_8_0', {})
-            esxi_7_0_info = esxi_info.get('ESXi_7_0', {})
-            vcenter_9_1_info = vcenter_info.get('vCenter_9_1', {})
-            vcenter_9_0_info = vcenter_info.get('vCenter_9_0', {})
-            vcenter_8_0_info = vcenter_info.get('vCenter_8_0', {})
-            vcenter_7_0_info = vcenter_info.get('vCenter_7_0', {})
-
-            # Generate HTML content
-            html_content = f"""
+            write_atomic(self.web_page_path,
+                         self.render_html_display(tools_info, esxi_info, vcenter_info))
+            
+            logger.info(f"Created HTML display page: {self.web_page_path}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error creating HTML display: {e}")
+            return False
+
+    def render_html_display(self, tools_info: Dict, esxi_info: Dict, vcenter_info: Dict,
+                            last_updated: Optional[str] = None) -> str:
+        """
+        Render the HTML display page with the version information.
+
+        Args:
+            tools_info: Dictionary containing VMware Tools version information
+            esxi_info: Dictionary containing ESXi version information
+            vcenter_info: Dictionary containing vCenter version information
+            last_updated: Timestamp to show (default: now)
+
+        Returns:
+            HTML document
+        """
+        # Get last updated timestamp
+        last_updated = last_updated or self.get_timestamp()
+
+        # Every renderer reads the same typed Release records
+        releases = [release for _, release, _ in iter_products(
+            {"VMwareTools": tools_info, "ESXi": esxi_info, "vCenter": vcenter_info})]
+        tools = next((release for release in releases if release.product_key == "VMwareTools"), None)
+
+        def tools_field(attr: str) -> str:
+            value = getattr(tools, attr) if tools else None
+            return 'Not Found' if value is None else value
+
+        # One card per discovered ESXi/vCenter section, in page order
+        version_cards = self.render_version_cards(release for release in releases
+                                                  if release.product_key != "VMwareTools")
+
+        # Generate HTML content
+        html_content = f"""
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -653,212 +1129,29 @@ class VMwareVersionScraper:
                 <div class="version-info">
                     <div class="info-item">
                         <div class="info-label">Version</div>
-                        <div class="info-value">{tools_info_safe.get('Version', 'Not Found')}</div>
+                        <div class="info-value">{tools_field('version')}</div>
                     </div>
                     <div class="info-item">
                         <div class="info-label">Release Date</div>
-                        <div class="info-value">{tools_info_safe.get('ReleaseDate', 'Not Found')}</div>
+                        <div class="info-value">{tools_field('release_date')}</div>
                     </div>
                     <div class="info-item">
                         <div class="info-label">Build Number</div>
-                        <div class="info-value">{tools_info_safe.get('BuildNumber', 'Not Found')}</div>
+                        <div class="info-value">{tools_field('build_number')}</div>
                     </div>
                     <div class="info-item">
                         <div class="info-label">Tool Internal Version</div>
-                        <div class="info-value">{tools_info_safe.get('ToolInternalVersion', 'Not Found')}</div>
+                        <div class="info-value">{tools_field('tool_internal_version')}</div>
                     </div>
                 </div>
                 <div style="margin-top: 20px; text-align: center;">
-                    <a href="https://packages-prod.broadcom.com/tools/releases/latest/windows/" target="_blank" class="download-btn">
+                    <a href="{TOOLS_DOWNLOAD_URL}" target="_blank" class="download-btn">
                         Download the latest VMware Tools
                     </a>
                 </div>
             </div>
             
-            <div class="version-card">
-                <h3>ESX 9.1</h3>
-                <div class="version-info">
-                    <div class="info-item">
-                        <div class="info-label">Version</div>
-                        <div class="info-value">{esx_9_1_info.get('Version', 'Not Found')}</div>
-                    </div>
-                    <div class="info-item">
-                        <div class="info-label">Release Name</div>
-                        <div class="info-value">{esx_9_1_info.get('ReleaseName', 'Not Found')}</div>
-                    </div>
-                    <div class="info-item">
-                        <div class="info-label">Release Date</div>
-                        <div class="info-value">{esx_9_1_info.get('ReleaseDate', 'Not Found')}</div>
-                    </div>
-                    <div class="info-item">
-                        <div class="info-label">Build Number</div>
-                        <div class="info-value">{esx_9_1_info.get('BuildNumber', 'Not Found')}</div>
-                    </div>
-                    <div class="info-item">
-                        <div class="info-label">Available As</div>
-                        <div class="info-value">{esx_9_1_info.get('AvailableAs', 'Not Found')}</div>
-                    </div>
-                </div>
-            </div>
-
-            <div class="version-card">
-                <h3>ESX 9.0</h3>
-                <div class="version-info">
-                    <div class="info-item">
-                        <div class="info-label">Version</div>
-                        <div class="info-value">{esx_9_0_info.get('Version', 'Not Found')}</div>
-                    </div>
-                    <div class="info-item">
-                        <div class="info-label">Release Name</div>
-                        <div class="info-value">{esx_9_0_info.get('ReleaseName', 'Not Found')}</div>
-                    </div>
-                    <div class="info-item">
-                        <div class="info-label">Release Date</div>
-                        <div class="info-value">{esx_9_0_info.get('ReleaseDate', 'Not Found')}</div>
-                    </div>
-                    <div class="info-item">
-                        <div class="info-label">Build Number</div>
-                        <div class="info-value">{esx_9_0_info.get('BuildNumber', 'Not Found')}</div>
-                    </div>
-                    <div class="info-item">
-                        <div class="info-label">Available As</div>
-                        <div class="info-value">{esx_9_0_info.get('AvailableAs', 'Not Found')}</div>
-                    </div>
-                </div>
-            </div>
-            
-            <div class="version-card">
-                <h3>ESXi 8.0</h3>
-                <div class="version-info">
-                    <div class="info-item">
-                        <div class="info-label">Version</div>
-                        <div class="info-value">{esxi_8_0_info.get('Version', 'Not Found')}</div>
-                    </div>
-                    <div class="info-item">
-                        <div class="info-label">Release Name</div>
-                        <div class="info-value">{esxi_8_0_info.get('ReleaseName', 'Not Found')}</div>
-                    </div>
-                    <div class="info-item">
-                        <div class="info-label">Release Date</div>
-                        <div class="info-value">{esxi_8_0_info.get('ReleaseDate', 'Not Found')}</div>
-                    </div>
-                    <div class="info-item">
-                        <div class="info-label">Build Number</div>
-                        <div class="info-value">{esxi_8_0_info.get('BuildNumber', 'Not Found')}</div>
-                    </div>
-                    <div class="info-item">
-                        <div class="info-label">Available As</div>
-                        <div class="info-value">{esxi_8_0_info.get('AvailableAs', 'Not Found')}</div>
-                    </div>
-                </div>
-            </div>
-            
-            <div class="version-card">
-                <h3>ESXi 7.0</h3>
-                <div class="version-info">
-                    <div class="info-item">
-                        <div class="info-label">Version</div>
-                        <div class="info-value">{esxi_7_0_info.get('Version', 'Not Found')}</div>
-                    </div>
-                    <div class="info-item">
-                        <div class="info-label">Release Name</div>
-                        <div class="info-value">{esxi_7_0_info.get('ReleaseName', 'Not Found')}</div>
-                    </div>
-                    <div class="info-item">
-                        <div class="info-label">Release Date</div>
-                        <div class="info-value">{esxi_7_0_info.get('ReleaseDate', 'Not Found')}</div>
-                    </div>
-                    <div class="info-item">
-                        <div class="info-label">Build Number</div>
-                        <div class="info-value">{esxi_7_0_info.get('BuildNumber', 'Not Found')}</div>
-                    </div>
-                    <div class="info-item">
-                        <div class="info-label">Available As</div>
-                        <div class="info-value">{esxi_7_0_info.get('AvailableAs', 'Not Found')}</div>
-                    </div>
-                </div>
-            </div>
-            
-            <div class="version-card">
-                <h3>vCenter 9.1</h3>
-                <div class="version-info">
-                    <div class="info-item">
-                        <div class="info-label">Version</div>
-                        <div class="info-value">{vcenter_9_1_info.get('Version', 'Not Found')}</div>
-                    </div>
-                    <div class="info-item">
-                        <div class="info-label">Release Date</div>
-                        <div class="info-value">{vcenter_9_1_info.get('ReleaseDate', 'Not Found')}</div>
-                    </div>
-                    <div class="info-item">
-                        <div class="info-label">Build Number</div>
-                        <div class="info-value">{vcenter_9_1_info.get('BuildNumber', 'Not Found')}</div>
-                    </div>
-                </div>
-            </div>
-
-            <div class="version-card">
-                <h3>vCenter 9.0</h3>
-                <div class="version-info">
-                    <div class="info-item">
-                        <div class="info-label">Version</div>
-                        <div class="info-value">{vcenter_9_0_info.get('Version', 'Not Found')}</div>
-                    </div>
-                    <div class="info-item">
-                        <div class="info-label">Release Date</div>
-                        <div class="info-value">{vcenter_9_0_info.get('ReleaseDate', 'Not Found')}</div>
-                    </div>
-                    <div class="info-item">
-                        <div class="info-label">Build Number</div>
-                        <div class="info-value">{vcenter_9_0_info.get('BuildNumber', 'Not Found')}</div>
-                    </div>
-                </div>
-            </div>
-            
-            <div class="version-card">
-                <h3>vCenter Server 8.0</h3>
-                <div class="version-info">
-                    <div class="info-item">
-                        <div class="info-label">Version</div>
-                        <div class="info-value">{vcenter_8_0_info.get('Version', 'Not Found')}</div>
-                    </div>
-                    <div class="info-item">
-                        <div class="info-label">Release Name</div>
-                        <div class="info-value">{vcenter_8_0_info.get('ReleaseName', 'Not Found')}</div>
-                    </div>
-                    <div class="info-item">
-                        <div class="info-label">Release Date</div>
-                        <div class="info-value">{vcenter_8_0_info.get('ReleaseDate', 'Not Found')}</div>
-                    </div>
-                    <div class="info-item">
-                        <div class="info-label">Build Number</div>
-                        <div class="info-value">{vcenter_8_0_info.get('BuildNumber', 'Not Found')}</div>
-                    </div>
-                </div>
-            </div>
-            
-            <div class="version-card">
-                <h3>vCenter Server 7.0</h3>
-                <div class="version-info">
-                    <div class="info-item">
-                        <div class="info-label">Version</div>
-                        <div class="info-value">{vcenter_7_0_info.get('Version', 'Not Found')}</div>
-                    </div>
-                    <div class="info-item">
-                        <div class="info-label">Release Name</div>
-                        <div class="info-value">{vcenter_7_0_info.get('ReleaseName', 'Not Found')}</div>
-                    </div>
-                    <div class="info-item">
-                        <div class="info-label">Release Date</div>
-                        <div class="info-value">{vcenter_7_0_info.get('ReleaseDate', 'Not Found')}</div>
-                    </div>
-                    <div class="info-item">
-                        <div class="info-label">Build Number</div>
-                        <div class="info-value">{vcenter_7_0_info.get('BuildNumber', 'Not Found')}</div>
-                    </div>
-                </div>
-            </div>
-            
+{version_cards}
             <button class="refresh-btn" onclick="location.reload()">Refresh Page</button>
         </div>
         
@@ -870,17 +1163,130 @@ class VMwareVersionScraper:
 </body>
 </html>
 """
-            
-            with open(self.web_page_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            
-            logger.info(f"Created HTML display page: {self.web_page_path}")
-            return True
-            
+        return html_content
+    
+    def render_version_cards(self, releases: Iterable[Release]) -> str:
+        """
+        Render a dashboard card for every ESXi or vCenter release.
+
+        Args:
+            releases: Release records, in page order
+
+        Returns:
+            HTML for the cards
+        """
+        cards = []
+        for release in releases:
+            items = "".join(f"""
+                    <div class="info-item">
+                        <div class="info-label">{label}</div>
+                        <div class="info-value">{getattr(release, attr)}</div>
+                    </div>""" for attr, label in CARD_FIELDS if getattr(release, attr) is not None)
+            cards.append(f"""            <div class="version-card">
+                <h3>{display_name(release.product_key)}</h3>
+                <div class="version-info">{items}
+                </div>
+            </div>
+""")
+        return "\n".join(cards)
+
+    def render_outputs(self, result: Dict, events: List[Dict]) -> Dict[str, str]:
+        """
+        Render every configured output format from one result.
+
+        Args:
+            result: Result from build_result()
+            events: Change events since the previous run (for the Atom feed)
+
+        Returns:
+            Dict mapping output path to rendered content
+        """
+        outputs = {}
+        if "json" in self.formats:
+            outputs[self.output_path] = self.render_json(result)
+        if "html" in self.formats:
+            outputs[self.web_page_path] = self.render_html_display(
+                result["VMwareTools"], result["ESXi"], result["vCenter"], result["LastUpdated"])
+        if "csv" in self.formats:
+            outputs[self.csv_path] = render_csv(result)
+        if "markdown" in self.formats:
+            outputs[self.markdown_path] = render_markdown(result)
+        if "atom" in self.formats:
+            outputs[self.atom_path] = render_atom(events, read_text(self.atom_path),
+                                                  feed_url=Path(self.atom_path).name)
+        if "dashboard" in self.formats:
+            outputs.update(render_shell(self.dashboard_path, self.compact_json_path))
+            outputs[self.compact_json_path] = render_compact_json(result)
+        return outputs
+
+    def publish_outputs(self, result: Dict, events: List[Dict]) -> bool:
+        """
+        Render all configured formats and write them concurrently and
+        atomically. Files whose content is unchanged are not rewritten.
+
+        Returns:
+            True if every output was written (or was already up to date)
+        """
+        try:
+            outputs = self.render_outputs(result, events)
         except Exception as e:
-            logger.error(f"Error creating HTML display: {e}")
+            logger.error(f"Error rendering outputs: {e}")
             return False
-    
+
+        ok = True
+        for path, written in write_outputs(outputs).items():
+            if written is None:
+                logger.error(f"✗ Failed to write {path}")
+                ok = False
+            elif written:
+                logger.info(f"✓ Wrote {path}")
+            else:
+                logger.info(f"✓ {path} unchanged, skipped")
+        if ok and "dashboard" in self.formats:
+            for path in prune_assets(self.dashboard_path, list(outputs)):
+                logger.info(f"✓ Removed old dashboard asset {path}")
+        return ok
+
+    def _scrape_all(self, sources: List, deadline: Deadline) -> Dict[str, Optional[Dict]]:
+        """
+        Run every source's scrape method within the run deadline.
+
+        Serially, each source gets an even share of the remaining time. With
+        more than one worker the sources are fetched concurrently and each may
+        use all of the remaining time.
+
+        Args:
+            sources: List of (source name, scrape method, JSON section)
+            deadline: Run-wide deadline
+
+        Returns:
+            Dict mapping JSON section to the scraped result (or None)
+        """
+        if self.workers <= 1:
+            return {section: scrape(timeout=deadline.share(len(sources) - i, cap=DEFAULT_TIMEOUT))
+                    for i, (_, scrape, section) in enumerate(sources)}
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        timeout = min(deadline.remaining(), DEFAULT_TIMEOUT)
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(sources))) as pool:
+            futures = {section: pool.submit(scrape, timeout=timeout)
+                       for _, scrape, section in sources}
+            return {section: future.result() for section, future in futures.items()}
+
+    def sources(self) -> List:
+        """
+        Sources this process scrapes: all of them, or its shard's share.
+
+        Returns:
+            List of (source name, scrape method, section of the JSON output)
+        """
+        return shard_sources([
+            ("tools", self.scrape_tools_version_info, "VMwareTools"),
+            ("esxi", self.scrape_esxi_version_info, "ESXi"),
+            ("vcenter", self.scrape_vcenter_version_info, "vCenter"),
+        ], self.shard)
+
     def run(self) -> bool:
         """
         Main execution method.
@@ -890,74 +1296,268 @@ class VMwareVersionScraper:
         """
         logger.info("=== VMware Versions Scraper ===")
         logger.info(f"Starting version check at {self.get_timestamp()}")
-        
-        # Get the latest VMware Tools version information
-        tools_info = self.scrape_tools_version_info()
-        
-        # Get the latest ESXi version information
-        esxi_info = self.scrape_esxi_version_info()
-        
-        # Get the latest vCenter version information
-        vcenter_info = self.scrape_vcenter_version_info()
-        
-        if tools_info:
-            logger.info(f"Latest VMware Tools Version: {tools_info['Version']}")
-            logger.info(f"Release Date: {tools_info['ReleaseDate']}")
-            logger.info(f"Build Number: {tools_info['BuildNumber']}")
-            logger.info(f"Tool Internal Version: {tools_info['ToolInternalVersion']}")
-        
-        if esxi_info:
-            for version_key, version_data in esxi_info.items():
-                if isinstance(version_data, dict) and "Version" in version_data:
-                    logger.info(f"Latest {version_key}: {version_data['Version']}")
-                    logger.info(f"Release Date: {version_data['ReleaseDate']}")
-                    logger.info(f"Build Number: {version_data['BuildNumber']}")
-                    logger.info(f"Available As: {version_data['AvailableAs']}")
-        
-        if vcenter_info:
-            for version_key, version_data in vcenter_info.items():
-                if isinstance(version_data, dict) and "Version" in version_data:
-                    logger.info(f"Latest {version_key}: {version_data['Version']}")
-                    logger.info(f"Release Date: {version_data['ReleaseDate']}")
-                    logger.info(f"Build Number: {version_data['BuildNumber']}")
-        
-        if tools_info or esxi_info or vcenter_info:
-            # Update JSON file
-            if self.update_json_file(tools_info or {}, esxi_info or {}, vcenter_info or {}):
-                logger.info("✓ JSON file updated successfully")
-            else:
-                logger.error("✗ Failed to update JSON file")
-                return False
-            
-            # Create HTML display
-            if self.create_html_display(tools_info or {}, esxi_info or {}, vcenter_info or {}):
-                logger.info("✓ HTML display page created successfully")
-                logger.info("You can open the HTML file in your browser to view the results")
-            else:
-                logger.error("✗ Failed to create HTML display")
-                return False
-            
-            return True
-        else:
+
+        deadline = Deadline(self.deadline)
+        sources = self.sources()
+        fetched = self._scrape_all(sources, deadline)
+        fresh = {}
+        for source, _, section in sources:
+            if fetched[section]:
+                fresh[section] = fetched[section]
+                self.last_good[source] = {"result": fetched[section], "saved_at": time.time()}
+        self.save_state()
+        self.save_parse_cache()
+
+        if not fresh:
             logger.error("✗ Failed to retrieve any version information")
             return False
 
+        if self.shard:
+            for source, _, section in sources:
+                if section in fresh:
+                    path = write_partial(self.partials_dir, source, section, fresh[section], self.worker_id)
+                    logger.info(f"✓ Wrote partial {path}")
+            return True
+
+        return self.publish(fresh)
+
+    def merge(self, max_age: Optional[float] = None) -> bool:
+        """
+        Publish the newest partial results written by shard workers.
+
+        Args:
+            max_age: Ignore partials older than this many seconds
+
+        Returns:
+            True if successful, False otherwise
+        """
+        logger.info(f"Merging partial results from {self.partials_dir}")
+        partials = load_partials(self.partials_dir, max_age)
+        if not partials:
+            logger.error(f"✗ No partial results found in {self.partials_dir}")
+            return False
+        return self.publish(partials)
+
+    def publish(self, fresh: Dict[str, Dict]) -> bool:
+        """
+        Combine freshly scraped sections with the published result and write
+        every output, holding the output lock.
+
+        Under the lock, each section is compared with the one currently
+        published: data that is older than what another run already published
+        is not written back, and sections without fresh data fall back to the
+        last known good result.
+
+        Args:
+            fresh: Dict mapping JSON section to its fresh result
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            with FileLock(self.lock_path, timeout=self.lock_timeout):
+                previous_result = self.load_previous_result() or {}
+                results = {}
+                for source, section in (("tools", "VMwareTools"), ("esxi", "ESXi"), ("vcenter", "vCenter")):
+                    info = fresh.get(section)
+                    previous = previous_result.get(section)
+                    if (info and previous and not previous.get("Stale")
+                            and section_time(previous) > section_time(info)):
+                        logger.warning(f"Keeping newer published {section} data from {previous['LastUpdated']}")
+                        info = previous
+                    results[section] = info or self._last_known_good(source, previous)
+
+                # Build one in-memory result and render every configured format from it
+                result = self.build_result(results["VMwareTools"] or {}, results["ESXi"] or {},
+                                           results["vCenter"] or {})
+                if self.crawler:
+                    # References from earlier crawls only; no requests under the lock
+                    result = self.crawler.annotate(result, fetch=False)
+                if logger.isEnabledFor(logging.INFO):
+                    for _, release, stale in iter_products(result):
+                        logger.info("Latest %s%s", release, " stale=True" if stale else "")
+                events = compute_change_events(previous_result, result)
+                if not self.publish_outputs(result, events):
+                    return False
+        except LockTimeoutError as e:
+            logger.error(f"✗ {e}")
+            return False
+
+        # Push change events to configured consumers
+        if self.notifier:
+            self.notifier.dispatch(events)
+
+        if self.crawler:
+            self.publish_crawl(result)
+
+        return True
+
+    def publish_crawl(self, result: Dict) -> None:
+        """
+        Crawl the release links of a just published result, outside the output
+        lock and on the crawler's own deadline, and publish the result again if
+        any References changed. A failed crawl only leaves References as they
+        were, and nothing is written if another run has published since.
+
+        Args:
+            result: The result publish() wrote
+        """
+        try:
+            annotated = self.crawler.annotate(result)
+        except Exception as e:
+            logger.warning(f"Link crawl failed: {e}")
+            return
+        if annotated == result:
+            return
+        try:
+            with FileLock(self.lock_path, timeout=self.lock_timeout):
+                published = self.load_previous_result() or {}
+                if published.get("LastUpdated") != result["LastUpdated"]:
+                    logger.info("Not adding crawled references: a newer result has been published")
+                    return
+                self.publish_outputs(annotated, [])
+        except LockTimeoutError as e:
+            logger.warning(f"Not adding crawled references: {e}")
+
 
 def main():
     """Main function to run the scraper."""
     import argparse
+
+    # Configure logging here rather than at import time so that importing this
+    # module (or vmware_client) does not change the caller's logging setup.
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     
     parser = argparse.ArgumentParser(description='VMware Versions Scraper')
     parser.add_argument('--output', '-o', default='vmware-versions.json',
                        help='Path for the JSON file (default: vmware-versions.json)')
     parser.add_argument('--webpage', '-w', default='vmware-versions.html',
                        help='Path for the HTML display page (default: vmware-versions.html)')
+    parser.add_argument('--formats', default='json,html',
+                       help=f"Comma-separated output formats from {', '.join(OUTPUT_FORMATS)} (default: json,html)")
+    parser.add_argument('--csv', default='vmware-versions.csv',
+                       help='Path for the CSV output (default: vmware-versions.csv)')
+    parser.add_argument('--markdown', default='vmware-versions.md',
+                       help='Path for the Markdown output (default: vmware-versions.md)')
+    parser.add_argument('--atom', default='vmware-versions.atom',
+                       help='Path for the Atom feed of build changes (default: vmware-versions.atom)')
+    parser.add_argument('--dashboard', default='vmware-dashboard.html',
+                       help='Client-rendered dashboard shell path (default: vmware-dashboard.html)')
+    parser.add_argument('--compact-json', default='vmware-versions.min.json',
+                       help='Compact JSON fetched by the dashboard shell (default: vmware-versions.min.json)')
+    parser.add_argument('--state', default='vmware-scraper-state.json',
+                       help='Path for circuit breaker / last known good state (default: vmware-scraper-state.json)')
+    parser.add_argument('--parse-cache', default='vmware-parse-cache.json',
+                       help='Path for the per-section parse cache (default: vmware-parse-cache.json)')
+    parser.add_argument('--deadline', type=float, default=60.0,
+                       help='Total seconds a run may spend fetching all sources (default: 60)')
+    parser.add_argument('--retries', type=int, default=2,
+                       help='Retries per source for transient errors (default: 2)')
+    parser.add_argument('--breaker-threshold', type=int, default=3,
+                       help='Consecutive failures before a host circuit opens (default: 3)')
+    parser.add_argument('--breaker-cooldown', type=float, default=900.0,
+                       help='Seconds an open circuit fails fast before a trial request (default: 900)')
+    parser.add_argument('--base-url', default=None,
+                       help='Fetch the KB articles from this base URL instead of knowledge.broadcom.com '
+                            '(e.g. a local mock server such as http://127.0.0.1:8808)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Number of sources to fetch concurrently (default: 1)')
+    parser.add_argument('--min-version', default=DEFAULT_MIN_VERSION,
+                       help=f'Oldest ESXi/vCenter major.minor section to track (default: {DEFAULT_MIN_VERSION})')
+    parser.add_argument('--shard', default=None, metavar='K/N',
+                       help='Scrape only every Nth source starting at the Kth and write partial results')
+    parser.add_argument('--merge', action='store_true',
+                       help='Publish the newest partial results written by --shard workers')
+    parser.add_argument('--partials', default='vmware-partials',
+                       help='Directory for partial results (default: vmware-partials)')
+    parser.add_argument('--worker-id', default=None,
+                       help='Name of this worker in partial file names (default: host name)')
+    parser.add_argument('--partial-max-age', type=float, default=None,
+                       help='With --merge, ignore partials older than this many seconds')
+    parser.add_argument('--lock-timeout', type=float, default=120.0,
+                       help='Seconds to wait for another run to finish publishing (default: 120)')
+    parser.add_argument('--crawl', action='store_true',
+                       help='Fetch linked release notes/download pages and attach summaries (CVEs, packages)')
+    parser.add_argument('--crawl-state', default='vmware-crawl-state.json',
+                       help='Visited set of crawled pages (default: vmware-crawl-state.json)')
+    parser.add_argument('--crawl-workers', type=int, default=4,
+                       help='Concurrent crawl requests (default: 4)')
+    parser.add_argument('--crawl-rate', type=float, default=1.0,
+                       help='Maximum crawl requests per second per host (default: 1)')
+    parser.add_argument('--crawl-deadline', type=float, default=30.0,
+                       help='Total seconds the crawl may take (default: 30)')
+    parser.add_argument('--crawl-revisit', type=float, default=86400.0,
+                       help='Seconds before a crawled page is revalidated (default: 86400)')
+    parser.add_argument('--notify-webhook', action='append', default=[],
+                       help='POST change events to this URL (may be repeated)')
+    parser.add_argument('--notify-socket', default=None,
+                       help='Send change events to this local Unix socket')
+    parser.add_argument('--notify-command', default=None,
+                       help='Run this command with change events as JSON on stdin')
+    parser.add_argument('--notify-queue', default='vmware-notify-queue.json',
+                       help='Path for the persistent notification queue (default: vmware-notify-queue.json)')
+    parser.add_argument('--notify-batch-size', type=int, default=50,
+                       help='Maximum change events per notification (default: 50)')
+    parser.add_argument('--notify-debounce', type=float, default=0.0,
+                       help='Seconds a change must be stable before it is sent (default: 0)')
     
     args = parser.parse_args()
+
+    formats = [f.strip() for f in args.formats.split(',') if f.strip()]
+    unknown = set(formats) - set(OUTPUT_FORMATS)
+    if unknown:
+        parser.error(f"Unknown output format(s): {', '.join(sorted(unknown))}")
+    missing = set(REQUIRED_FORMATS) - set(formats)
+    if missing:
+        parser.error(f"--formats must include {', '.join(sorted(missing))}: change events and "
+                     f"stale fallback compare each run with the published {args.output}")
+    try:
+        parse_min_version(args.min_version)
+        shard = parse_shard(args.shard) if args.shard else None
+    except ValueError as e:
+        parser.error(str(e))
+    if shard and args.merge:
+        parser.error("--shard and --merge are separate steps; run them as separate commands")
     
-    scraper = VMwareVersionScraper(output_path=args.output, web_page_path=args.webpage)
+    notifier = ChangeNotifier(webhooks=args.notify_webhook,
+                              socket_path=args.notify_socket,
+                              command=args.notify_command,
+                              queue_path=args.notify_queue,
+                              batch_size=args.notify_batch_size,
+                              debounce=args.notify_debounce)
+    crawler = None
+    if args.crawl:
+        crawler = LinkCrawler(state_path=args.crawl_state,
+                              workers=args.crawl_workers,
+                              rate=args.crawl_rate,
+                              deadline=args.crawl_deadline,
+                              revisit=args.crawl_revisit,
+                              extra_links={"VMwareTools": [TOOLS_DOWNLOAD_URL]})
+    scraper = VMwareVersionScraper(output_path=args.output, web_page_path=args.webpage,
+                                   notifier=notifier,
+                                   crawler=crawler,
+                                   # Shard workers keep their own state and parse cache
+                                   state_path=shard_path(args.state, shard),
+                                   deadline=args.deadline,
+                                   max_retries=args.retries,
+                                   breaker_threshold=args.breaker_threshold,
+                                   breaker_cooldown=args.breaker_cooldown,
+                                   parse_cache_path=shard_path(args.parse_cache, shard),
+                                   base_url=args.base_url,
+                                   workers=args.workers,
+                                   formats=formats,
+                                   csv_path=args.csv,
+                                   markdown_path=args.markdown,
+                                   atom_path=args.atom,
+                                   dashboard_path=args.dashboard,
+                                   compact_json_path=args.compact_json,
+                                   min_version=args.min_version,
+                                   shard=args.shard,
+                                   partials_dir=args.partials,
+                                   worker_id=args.worker_id,
+                                   lock_timeout=args.lock_timeout)
     
-    success = scraper.run()
+    success = scraper.merge(args.partial_max_age) if args.merge else scraper.run()
     
     if success:
         logger.info(f"Script completed at {scraper.get_timestamp()}")
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+VMware Version Keys
+Normalizes ESXi, vCenter and VMware Tools version strings into sortable
+integer tuples and packed 64-bit keys.
+
+Every version becomes (major, minor, update, build, patch, sub):
+
+    "ESXi 8.0 Update 3k"       -> (8, 0, 3, 0, 0, 11)
+    "ESXi 8.0.3 EP6"           -> (8, 0, 3, 0, 6, 0)
+    "ESX 9.1.0.0200"           -> (9, 1, 0, 0, 200, 0)
+    "8.0.3.01000"              -> (8, 0, 3, 0, 1000, 0)
+    "VMware Tools 13.1.0.0"    -> (13, 1, 0, 0, 0, 0)
+    "13344" (internal version) -> (13, 1, 0, 0, 0, 0)
+    "ESXi670-202210001"        -> (6, 7, 0, 0, 2210, 0)
+
+`sub` is the letter suffix (a=1 ... z=26) of "8.0c", "Update 3k" or
+"EP 02a". Within one update, releases are ranked on their build number when it
+is given: patches ("P09"), express patches ("EP6") and lettered updates
+("Update 1d") are numbered independently of each other, so only the build
+tells their release order. Without a build (0) they fall back to patch and
+letter. Packed keys
+compare exactly like the tuples, so bulk data can be kept in an array('Q')
+(or a numpy uint64 array) and sorted without touching the strings again.
+
+Running this module validates the parser against every version cell in the
+saved debug-*.html pages.
+"""
+
+import re
+import sys
+from array import array
+from functools import lru_cache
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy
+except ImportError:  # numpy is optional; bulk sorting falls back to sorted()
+    numpy = None
+
+VersionKey = Tuple[int, int, int, int, int, int]
+
+# Field widths of the packed 64-bit key, most significant first:
+# major(6) minor(5) update(5) build(27) patch(16) sub(5)
+_FIELDS = (("major", 6), ("minor", 5), ("update", 5), ("build", 27), ("patch", 16), ("sub", 5))
+_SHIFTS = []
+_shift = 64
+for _name, _bits in _FIELDS:
+    _shift -= _bits
+    _SHIFTS.append((_shift, (1 << _bits) - 1))
+del _shift, _name, _bits
+_BUILD_SHIFT, _BUILD_MASK = _SHIFTS[3]
+
+# "ESXi670-202210001": patch bundle named after version 6.7.0 and date 2022-10.
+_BUNDLE_RE = re.compile(r'(\d)(\d)(\d)-(20\d\d)(\d\d)\d+')
+# Dotted version core, optionally followed by a single letter ("8.0c", "6.5.0a").
+_CORE_RE = re.compile(r'(\d+)(?:\.(\d+))?(?:\.(\d+))?(?:\.(\d+))?\.?(?:([a-zA-Z])(?![a-zA-Z]))?')
+_UPDATE_RE = re.compile(r'\b(?:Update|U)\s*(\d+)([a-zA-Z])?\b', re.IGNORECASE)
+_PATCH_RE = re.compile(r'\b(?:EP|Express\s+Patch|Patch|P)\s*(\d+)([a-zA-Z])?\b', re.IGNORECASE)
+_BUILD_RE = re.compile(r'\d+')
+
+
+def _letter(value: Optional[str]) -> int:
+    return ord(value.lower()) - ord('a') + 1 if value else 0
+
+
+def _fits(key: VersionKey) -> bool:
+    return all(0 <= value <= mask for value, (_, mask) in zip(key, _SHIFTS))
+
+
+def _with_build(parsed: Tuple[int, int, int, int, int], build: int) -> VersionKey:
+    return parsed[:3] + (build,) + parsed[3:]
+
+
+def parse_build(text) -> int:
+    """
+    Parse a build number cell such as "25218885", "5146846 / 5146843" or
+    "ISO 3634788ZIP 3634791" (the first number wins).
+
+    Returns:
+        Build number, or 0 if the cell has none
+    """
+    if isinstance(text, int):
+        return text
+    match = _BUILD_RE.search(text or "")
+    return int(match.group(0)) if match else 0
+
+
+@lru_cache(maxsize=65536)
+def _parse(text: str) -> Optional[Tuple[int, int, int, int, int]]:
+    text = text.replace('&nbsp;', ' ').strip()
+    if not text:
+        return None
+
+    # Plain integer: a VMware Tools internal version, which encodes
+    # major.minor.update as major << 10 | minor << 5 | update.
+    if text.isdigit():
+        value = int(text)
+        if value >= 1 << 16:
+            return None  # a build number, not a version
+        return (value >> 10, (value >> 5) & 31, value & 31, 0, 0)
+
+    bundle = _BUNDLE_RE.search(text)
+    if bundle:
+        major, minor, update, year, month = (int(g) for g in bundle.groups())
+        return (major, minor, update, (year - 2000) * 100 + month, 0)
+
+    first_digit = re.search(r'\d', text)
+    if not first_digit:
+        return None
+    core = _CORE_RE.match(text, first_digit.start())
+    # A bare number followed by "/" or "-" is a date, not a version.
+    if core.group(2) is None and text[core.end():core.end() + 1] in "/-":
+        return None
+    major = int(core.group(1))
+    minor = int(core.group(2) or 0)
+    update = int(core.group(3) or 0)
+    patch = int(core.group(4) or 0)
+    sub = _letter(core.group(5))
+
+    rest = text[core.end():]
+    update_match = _UPDATE_RE.search(rest)
+    if update_match:
+        update = int(update_match.group(1))
+        sub = _letter(update_match.group(2)) or sub
+    patch_match = _PATCH_RE.search(rest)
+    if patch_match:
+        patch = int(patch_match.group(1))
+        sub = _letter(patch_match.group(2)) or sub
+    return (major, minor, update, patch, sub)
+
+
+def parse_version(text: str, build=None) -> Optional[VersionKey]:
+    """
+    Normalize a version string into a (major, minor, update, build, patch, sub)
+    tuple.
+
+    Args:
+        text: Version or release name (e.g. "ESXi 8.0 Update 3k")
+        build: Optional build number (int or cell text) that orders releases
+            within the same update
+
+    Returns:
+        Version tuple, or None if text is not a version or does not fit the
+        packed key layout
+    """
+    parsed = _parse(text or "")
+    if parsed is None:
+        return None
+    key = _with_build(parsed, parse_build(build) if build is not None else 0)
+    return key if _fits(key) else None
+
+
+def pack(key: VersionKey) -> int:
+    """Pack a version tuple into a 64-bit integer that sorts the same way."""
+    if not _fits(key):
+        raise ValueError(f"Version key out of range: {key}")
+    packed = 0
+    for value, (shift, _) in zip(key, _SHIFTS):
+        packed |= value << shift
+    return packed
+
+
+def unpack(packed: int) -> VersionKey:
+    """Inverse of pack()."""
+    return tuple((packed >> shift) & mask for shift, mask in _SHIFTS)
+
+
+@lru_cache(maxsize=65536)
+def _packed_base(text: str) -> int:
+    parsed = _parse(text)
+    if parsed is None:
+        return 0
+    key = _with_build(parsed, 0)
+    return pack(key) if _fits(key) else 0
+
+
+def version_key(text: str, build=None) -> int:
+    """
+    Packed 64-bit key for a version string; 0 if it cannot be parsed, so
+    unparseable values sort first.
+    """
+    base = _packed_base(text or "")
+    if not base or build is None:
+        return base
+    build = parse_build(build)
+    return base | build << _BUILD_SHIFT if 0 <= build <= _BUILD_MASK else 0
+
+
+def parse_many(texts: Iterable[str], builds: Optional[Iterable] = None) -> array:
+    """
+    Parse many version strings into a compact array('Q') of packed keys.
+
+    Args:
+        texts: Version strings
+        builds: Optional build numbers, parallel to texts
+
+    Returns:
+        array('Q') of packed keys (0 for unparseable values)
+    """
+    if builds is None:
+        return array('Q', map(_packed_base, texts))
+    return array('Q', (version_key(text, build) for text, build in zip(texts, builds)))
+
+
+def argsort(keys: Sequence[int], reverse: bool = False) -> List[int]:
+    """
+    Indices that sort packed keys, using numpy when it is installed.
+
+    Args:
+        keys: Packed keys, e.g. from parse_many()
+        reverse: Newest first if True
+
+    Returns:
+        List of indices into keys
+    """
+    if numpy is not None and len(keys) > 1024:
+        order = numpy.argsort(numpy.frombuffer(array('Q', keys), dtype=numpy.uint64), kind='stable')
+        return (order[::-1] if reverse else order).tolist()
+    return sorted(range(len(keys)), key=keys.__getitem__, reverse=reverse)
+
+
+def sort(texts: Sequence[str], builds: Optional[Sequence] = None, reverse: bool = False) -> List[str]:
+    """
+    Sort version strings by their normalized keys (oldest first by default).
+
+    Args:
+        texts: Version strings
+        builds: Optional build numbers, parallel to texts
+        reverse: Newest first if True
+
+    Returns:
+        New sorted list of the version strings
+    """
+    keys = parse_many(texts, builds)
+    return [texts[i] for i in argsort(keys, reverse=reverse)]
+
+
+def compare(a: str, b: str, build_a=None, build_b=None) -> int:
+    """
+    Compare two version strings.
+
+    Returns:
+        -1 if a < b, 0 if equal, 1 if a > b
+    """
+    key_a, key_b = version_key(a, build_a), version_key(b, build_b)
+    return (key_a > key_b) - (key_a < key_b)
+
+
+def _version_cells(content: str):
+    """Yield (header, cell text, build cell text) for every version cell in every table."""
+    strip = lambda html: re.sub(r'<[^>]+>', '', html).replace('&nbsp;', ' ').strip()
+    for table in re.finditer(r'<table[^>]*>(.*?)</table>', content, re.DOTALL | re.IGNORECASE):
+        rows = [[strip(cell) for cell in re.findall(r'<t[dh][^>]*>(.*?)</t[dh]>', row, re.DOTALL | re.IGNORECASE)]
+                for row in re.findall(r'<tr[^>]*>(.*?)</tr>', table.group(1), re.DOTALL | re.IGNORECASE)]
+        if not rows:
+            continue
+        header = [cell.lower() for cell in rows[0]]
+        version_cols = [i for i, name in enumerate(header)
+                        if ('version' in name or 'release name' in name) and 'date' not in name]
+        build_cols = [i for i, name in enumerate(header) if 'build' in name]
+        for row in rows[1:]:
+            for i in version_cols:
+                if i < len(row) and row[i] and row[i].upper() != 'N/A':
+                    build = row[build_cols[0]] if build_cols and build_cols[0] < len(row) else None
+                    yield header[i], row[i], build
+
+
+def _misordered(cells: List[Tuple[str, str, Optional[str]]]) -> List[Tuple[str, str]]:
+    """
+    Find adjacent releases that sort() puts in a different order than their
+    build numbers, within each (major, minor, update) group.
+
+    Returns:
+        List of (version sorted first, version sorted second) pairs whose
+        builds go backwards
+    """
+    groups = {}
+    for _, text, build in cells:
+        key = parse_version(text, build)
+        if key is not None and parse_build(build):
+            groups.setdefault(key[:3], {})[text, parse_build(build)] = None
+    misordered = []
+    for releases in groups.values():
+        texts = [text for text, _ in releases]
+        builds = [build for _, build in releases]
+        ordered = [(texts[i], builds[i]) for i in argsort(parse_many(texts, builds))]
+        misordered.extend((a, b) for (a, build_a), (b, build_b) in zip(ordered, ordered[1:])
+                          if build_b < build_a)
+    return misordered
+
+
+def validate(paths: List[str]) -> bool:
+    """
+    Parse every version cell of every table in the given HTML pages, and check
+    that sorting by key agrees with build order within each
+    (major, minor, update) group.
+
+    Returns:
+        True if all cells parsed and sorted in build order
+    """
+    ok = True
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            cells = list(_version_cells(f.read()))
+        failures = [(header, text) for header, text, build in cells if parse_version(text, build) is None]
+        misordered = _misordered(cells)
+        print(f"{path}: {len(cells) - len(failures)}/{len(cells)} version cells parsed, "
+              f"{len(misordered)} sorted out of build order")
+        for header, text in failures:
+            print(f"  unparsed {header!r}: {text!r}")
+        for first, second in misordered:
+            print(f"  {first!r} sorts before {second!r} but has a newer build")
+        ok = ok and not failures and not misordered
+    return ok
+
+
+if __name__ == "__main__":
+    pages = sys.argv[1:] or ["debug-tools-content.html", "debug-esxi-content.html",
+                             "debug-vcenter-content.html"]
+    sys.exit(0 if validate(pages) else 1)